@@ -2,11 +2,13 @@ from flask import Flask
 from flask_cors import CORS
 
 from app.routes import api_bp
-from app.extensions import db, migrate, jwt
+from app.extensions import db, migrate, jwt, engine_options
+from app.serialization import FastJSONProvider
 
 
 def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True)
+    app.json = FastJSONProvider(app)
 
     # set up app configuration
     app.config.from_object('config.Config')
@@ -16,6 +18,10 @@ def create_app(test_config=None):
     if test_config:
         app.config.from_mapping(test_config)
 
+    # derive pool settings unless explicitly configured
+    if 'SQLALCHEMY_ENGINE_OPTIONS' not in app.config:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
@@ -26,6 +32,38 @@ def create_app(test_config=None):
     # register blueprints
     app.register_blueprint(api_bp)
 
+    from app.summary import summarize_graphs_command
+    app.cli.add_command(summarize_graphs_command)
+
     from app.models import User, Graph, TSPRun
 
+    if app.config['PRELOAD_SOLVERS']:
+        warm_up()
+
     return app
+
+
+def warm_up():
+    """
+    Import the solver modules and run them on tiny graphs, so networkx's
+    lazily compiled dispatchers are built before any request arrives.
+    Called in the gunicorn master, the result is shared with the forked
+    workers copy-on-write.
+    """
+    import app.utils as utils
+
+    directed = utils.build_digraph({'edges': [
+        {'from': 0, 'to': 1, 'weight': 1},
+        {'from': 1, 'to': 2, 'weight': 2},
+        {'from': 2, 'to': 3, 'weight': 1},
+        {'from': 3, 'to': 0, 'weight': 2},
+        {'from': 0, 'to': 2, 'weight': 3},
+    ]})
+    symmetric = directed.to_undirected().to_directed()
+
+    for graph in (directed, symmetric):
+        utils.nx.is_strongly_connected(graph)
+        for method in ('greedy', 'simulated_annealing', 'threshold_accepting'):
+            utils.traveling_salesman_path(graph, method)
+    utils.graph_summary({'edges': [], 'nodes': []})
+    utils.terminal_distance_matrix(directed, [0, 2])
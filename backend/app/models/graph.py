@@ -3,12 +3,42 @@ from app.extensions import db
 
 class Graph(BaseModel):
     __tablename__ = 'graphs'
+    __table_args__ = (
+        db.Index('ix_graphs_user_id_id', 'user_id', 'id'),
+    )
 
     name = db.Column(db.String(80), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     data = db.Column(db.JSON, nullable=False)
 
+    # Summary metrics derived from data, NULL until computed (see app.summary)
+    node_count = db.Column(db.Integer)
+    edge_count = db.Column(db.Integer)
+    density = db.Column(db.Float)
+    weight_min = db.Column(db.Float)
+    weight_max = db.Column(db.Float)
+    weight_mean = db.Column(db.Float)
+    scc_count = db.Column(db.Integer)
+    is_symmetric = db.Column(db.Boolean)
+
     tspruns = db.relationship('TSPRun', backref='graph', lazy='dynamic', cascade='all, delete-orphan')
 
+    SUMMARY_FIELDS = (
+        'node_count', 'edge_count', 'density', 'weight_min',
+        'weight_max', 'weight_mean', 'scc_count', 'is_symmetric',
+    )
+
+    @classmethod
+    def summary_of(cls, row):
+        """Summary metrics of a Graph, or of a query row with the SUMMARY_FIELDS columns, or None if not computed yet."""
+        if row.node_count is None:
+            return None
+        return {field: getattr(row, field) for field in cls.SUMMARY_FIELDS}
+
+    @property
+    def summary(self):
+        """The stored summary metrics, or None if they are not computed yet."""
+        return self.summary_of(self)
+
     def __repr__(self):
         return f'<Graph {self.name}>'
@@ -3,6 +3,9 @@ from app.extensions import db
 
 class TSPRun(BaseModel):
     __tablename__ = 'tspruns'
+    __table_args__ = (
+        db.Index('ix_tspruns_graph_id_id', 'graph_id', 'id'),
+    )
 
     graph_id = db.Column(db.Integer, db.ForeignKey('graphs.id'), nullable=False)
     algorithm = db.Column(db.String(50), nullable=False)
@@ -12,3 +15,49 @@ class TSPRun(BaseModel):
 
     def __repr__(self):
         return f'<TSPRun {self.id} for Graph {self.graph_id} using {self.algorithm}>'
+
+    @classmethod
+    def stats_by_algorithm(cls, graph_id, percentiles=(50, 90, 95)):
+        """
+        Aggregate cost and runtime per algorithm for a graph in a single query.
+        Percentiles use the nearest-rank method so they can be computed with
+        window functions on both SQLite and Postgres, so p50 is the lower middle
+        value for an even number of runs; median averages the two middle values.
+        """
+        ranked = db.session.query(
+            cls.algorithm,
+            cls.cost,
+            cls.time_to_calculate,
+            db.func.row_number().over(partition_by=cls.algorithm, order_by=cls.cost).label('cost_rank'),
+            db.func.row_number().over(partition_by=cls.algorithm, order_by=cls.time_to_calculate).label('time_rank'),
+            db.func.count().over(partition_by=cls.algorithm).label('total'),
+        ).filter(cls.graph_id == graph_id).subquery()
+
+        metrics = (('cost', ranked.c.cost_rank), ('time_to_calculate', ranked.c.time_rank))
+        columns = [ranked.c.algorithm, db.func.count().label('runs')]
+        for metric, rank in metrics:
+            value = ranked.c[metric]
+            columns += [
+                db.func.min(value).label(f'{metric}_min'),
+                db.func.max(value).label(f'{metric}_max'),
+                db.func.avg(value).label(f'{metric}_mean'),
+                # the middle rank, or the two middle ranks for an even count
+                db.func.avg(db.case((db.and_(rank * 2 >= ranked.c.total, rank * 2 <= ranked.c.total + 2), value)))
+                .label(f'{metric}_median'),
+            ]
+            for p in percentiles:
+                # smallest value whose rank reaches p% of the group
+                columns.append(db.func.min(db.case((rank * 100 >= ranked.c.total * p, value))).label(f'{metric}_p{p}'))
+
+        rows = db.session.query(*columns).group_by(ranked.c.algorithm).order_by(ranked.c.algorithm).all()
+
+        stats = {}
+        for row in rows:
+            row = row._mapping
+            stats[row['algorithm']] = {'runs': row['runs']}
+            for metric, _ in metrics:
+                stats[row['algorithm']][metric] = {
+                    key: row[f'{metric}_{key}']
+                    for key in ['min', 'max', 'mean', 'median'] + [f'p{p}' for p in percentiles]
+                }
+        return stats
@@ -1,11 +1,12 @@
-import networkx as nx
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
 import time
 
 from app.models import User, Graph, TSPRun
 from app.extensions import db
-import app.utils as utils
+import app.run_writer as run_writer
+import app.serialization as serialization
+import app.summary as summary
 
 
 api_bp = Blueprint('api', __name__)
@@ -79,9 +80,15 @@ def delete_user():
 def get_user_graphs():
     """Get all graphs for the logged-in user."""
     user_id = get_jwt_identity()
-    graphs = Graph.query.filter_by(user_id=user_id).all()
+    summary_columns = [getattr(Graph, field) for field in Graph.SUMMARY_FIELDS]
+    graphs = Graph.query.filter_by(user_id=user_id).with_entities(Graph.id, Graph.name, *summary_columns).all()
     graph_ids = [graph.id for graph in graphs]
-    return jsonify({'graph_ids': graph_ids}), 200
+    graphs_data = [{
+        "id": graph.id,
+        "name": graph.name,
+        "summary": Graph.summary_of(graph)
+    } for graph in graphs]
+    return jsonify({'graph_ids': graph_ids, 'graphs': graphs_data}), 200
 
 
 @api_bp.route('/api/graphs', methods=['POST'])
@@ -94,15 +101,23 @@ def create_user_graph():
     if not data:
         return jsonify({"error": "Missing required fields"}), 400
 
+    error = summary.validate_graph_data(data.get('data'))
+    if error:
+        return jsonify({"error": error}), 400
+
     try:
         new_graph = Graph(
             name=data['name'],
             user_id=user_id,
             data=data['data']
         )
+        summarized = summary.update_graph_summary(new_graph)
         db.session.add(new_graph)
         db.session.commit()
 
+        if not summarized:
+            summary.schedule_graph_summary(new_graph.id)
+
         return jsonify({
             "message": "Graph created successfully",
             "graph_id": new_graph.id
@@ -122,16 +137,23 @@ def get_user_graph(graph_id):
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
 
+    compact = serialization.wants_compact()
+
     try:
         graph_data = {
             "id": graph.id,
             "name": graph.name,
             "user_id": graph.user_id,
-            "graph": graph.data,
+            "graph": serialization.compact_graph(graph.data) if compact else graph.data,
+            "summary": graph.summary,
             "created_at": graph.created_at,
             "updated_at": graph.updated_at
         }
-        return jsonify(graph_data), 200
+        response = jsonify(graph_data)
+        if compact:
+            response.mimetype = serialization.COMPACT_MIMETYPE
+        response.vary.add('Accept')
+        return response, 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     
@@ -141,7 +163,7 @@ def get_user_graph(graph_id):
 def update_user_graph(graph_id):
     """Update a specific graph for the logged-in user, and delete all associated TSP runs."""
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
@@ -150,6 +172,10 @@ def update_user_graph(graph_id):
     if not data or "data" not in data:
         return jsonify({"error": "Missing 'data' field"}), 400
 
+    error = summary.validate_graph_data(data['data'])
+    if error:
+        return jsonify({"error": error}), 400
+
     try:
         # Delete all associated TSP results before updating the graph
         TSPRun.query.filter_by(graph_id=graph_id).delete()
@@ -160,11 +186,15 @@ def update_user_graph(graph_id):
         
         # Update other graph data (nodes and edges)
         graph.data = data['data']
+        summarized = summary.update_graph_summary(graph)
 
         # Update timestamp
         graph.updated_at = db.func.now()
 
         db.session.commit()
+
+        if not summarized:
+            summary.schedule_graph_summary(graph.id)
         return jsonify({"message": "Graph and associated TSP runs updated successfully"}), 200
     except Exception as e:
         db.session.rollback()
@@ -176,7 +206,7 @@ def update_user_graph(graph_id):
 def delete_user_graph(graph_id):
     """Delete a specific graph for the logged-in user."""
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
@@ -196,73 +226,266 @@ def delete_user_graph(graph_id):
 @api_bp.route('/api/graphs/<int:graph_id>/tsp', methods=['GET'])
 @jwt_required()
 def get_graph_tsp(graph_id):
-    """Get the Traveling Salesman Path for a specific graph."""
+    """
+    Get the Traveling Salesman Path for a specific graph.
+    ?warm_start=best or ?warm_start=<run_id> seeds the local search and
+    annealing methods with a stored tour instead of the greedy one.
+    """
     user_id = get_jwt_identity()
     graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
 
+    # Solver modules pull in networkx/scipy, so they are imported on first use
+    # (or preloaded by warm_up) rather than when the app is created
+    import networkx as nx
+    import app.utils as utils
+
     algo = request.args.get('algo', 'asadpour')
+    warm_start = request.args.get('warm_start')
+
+    init_order = None
+    warm_start_run_id = None
+    if warm_start:
+        if algo not in utils.WARM_START_METHODS:
+            return jsonify({"error": f"warm_start is only supported for {', '.join(utils.WARM_START_METHODS)}"}), 400
+
+        runs = TSPRun.query.filter_by(graph_id=graph.id).with_entities(TSPRun.id, TSPRun.path)
+        if warm_start == 'best':
+            warm_run = runs.order_by(TSPRun.cost, TSPRun.id).first()
+        elif warm_start.isdigit():
+            warm_run = runs.filter(TSPRun.id == int(warm_start)).first()
+            if not warm_run:
+                return jsonify({"error": "TSP run not found"}), 404
+        else:
+            return jsonify({"error": "warm_start must be 'best' or a TSP run id"}), 400
+
+        # with no runs yet, 'best' falls back to a cold start
+        if warm_run:
+            init_order = utils.compress_tour(warm_run.path)
+            warm_start_run_id = warm_run.id
 
     try:
-        G = nx.DiGraph()
-        G.add_weighted_edges_from(
-            [(edge['from'], edge['to'], edge['weight']) for edge in graph.data['edges']]
-        )
+        G = utils.build_digraph(graph.data)
         if len(G.nodes) < 3:
             return jsonify({"error": "Graph must have at least 3 nodes"}), 400
         if not nx.is_strongly_connected(G):
             return jsonify({"error": "Graph must be strongly connected"}), 400
+        symmetric = utils.is_symmetric(G)
+        if algo in utils.SYMMETRIC_ONLY_METHODS and not symmetric:
+            return jsonify({"error": f"'{algo}' requires a symmetric graph"}), 400
+        # the stored tour may predate an edit to the graph
+        if init_order is not None and (len(init_order) != len(G) or set(init_order) != set(G.nodes)):
+            return jsonify({"error": "The warm start run does not cover the current graph's nodes"}), 400
+
+        def solve():
+            start_time = time.time()
+            tsp_path = utils.traveling_salesman_path(G, algo, symmetric=symmetric, init_order=init_order)
+            end_time = time.time()
+            cost = utils.get_path_cost(G, tsp_path)
+
+            run_id = run_writer.store_tsp_run(
+                graph_id=graph_id,
+                algorithm=algo,
+                path=tsp_path,
+                cost=cost,
+                time_to_calculate=end_time - start_time
+            )
+            return {
+                "run_id": run_id,
+                "tsp_path": tsp_path,
+                "cost": cost,
+                "time_to_calculate": end_time - start_time,
+                "warm_start_run_id": warm_start_run_id
+            }
+
+        # identical requests already being solved share that solve and its stored run
+        flight_key = (user_id, graph_id, str(graph.updated_at), algo, warm_start_run_id)
+        # release the connection before waiting on the solve, ours or another request's
+        db.session.commit()
+        wait_timeout = current_app.config['TSP_SOLVE_WAIT_TIMEOUT'] + current_app.config['TSP_RUN_WRITE_TIMEOUT']
+        result, _ = run_writer.tsp_solves.do(flight_key, solve, timeout=wait_timeout)
+        return jsonify(result), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/api/graphs/<int:graph_id>/distances', methods=['POST'])
+@jwt_required()
+def get_graph_terminal_distances(graph_id):
+    """
+    Get the shortest path distance matrix between a list of terminal nodes.
+    Rows and columns follow the order of 'terminals'; unreachable pairs are null.
+    Set 'paths' to true to also get the node path for every pair.
+    """
+    user_id = get_jwt_identity()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+
+    if not graph:
+        return jsonify({"error": "Graph not found"}), 404
+
+    data = request.get_json()
+    if not data or not isinstance(data.get('terminals'), list):
+        return jsonify({"error": "Missing 'terminals' field"}), 400
+
+    import app.utils as utils
+
+    terminals = data['terminals']
+    if not all(isinstance(node, (str, int)) and not isinstance(node, bool) for node in terminals):
+        return jsonify({"error": "Terminals must be strings or integers"}), 400
+
+    try:
+        G = utils.build_digraph(graph.data)
+        if len(set(terminals)) != len(terminals) or not all(node in G for node in terminals):
+            return jsonify({"error": "Terminals must be distinct nodes of the graph"}), 400
+
+        if data.get('paths'):
+            distances, paths = utils.terminal_distance_matrix(G, terminals, with_paths=True)
+            return jsonify({"terminals": terminals, "distances": distances, "paths": paths}), 200
+        distances = utils.terminal_distance_matrix(G, terminals)
+        return jsonify({"terminals": terminals, "distances": distances}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/api/graphs/<int:graph_id>/tsp/terminals', methods=['POST'])
+@jwt_required()
+def get_graph_terminal_tsp(graph_id):
+    """
+    Get a Traveling Salesman Path that visits only the given terminal nodes,
+    passing through other nodes where needed. The result is not stored as a TSP run.
+    """
+    user_id = get_jwt_identity()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+
+    if not graph:
+        return jsonify({"error": "Graph not found"}), 404
+
+    data = request.get_json()
+    if not data or not isinstance(data.get('terminals'), list):
+        return jsonify({"error": "Missing 'terminals' field"}), 400
+
+    import app.utils as utils
+
+    terminals = data['terminals']
+    algo = data.get('algo', 'greedy')
+    if not all(isinstance(node, (str, int)) and not isinstance(node, bool) for node in terminals):
+        return jsonify({"error": "Terminals must be strings or integers"}), 400
+    if len(terminals) < 3:
+        return jsonify({"error": "At least 3 terminals are required"}), 400
+
+    try:
+        G = utils.build_digraph(graph.data)
+        if len(set(terminals)) != len(terminals) or not all(node in G for node in terminals):
+            return jsonify({"error": "Terminals must be distinct nodes of the graph"}), 400
 
         start_time = time.time()
-        tsp_path = utils.traveling_salesman_path(G, algo)
+        tsp_path = utils.terminal_tsp_path(G, terminals, algo)
         end_time = time.time()
-        cost = utils.get_path_cost(G, tsp_path)
-
-        tsp_run = TSPRun(
-            graph_id=graph.id,
-            algorithm=algo,
-            path=tsp_path,
-            cost=cost,
-            time_to_calculate=end_time - start_time
-        )
-        db.session.add(tsp_run)
-        db.session.commit()
 
         return jsonify({
             "tsp_path": tsp_path,
-            "cost": cost,
+            "cost": utils.get_path_cost(G, tsp_path),
             "time_to_calculate": end_time - start_time
         }), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
 @api_bp.route('/api/graphs/<int:graph_id>/tsp/runs', methods=['GET'])
 @jwt_required()
 def get_graph_tsp_runs(graph_id):
-    """Get all TSP runs for a specific graph."""
+    """
+    Get TSP runs for a specific graph.
+    Passing ?page= returns one page of runs (size set by ?per_page=) wrapped
+    with pagination info; ?include_path=false omits the path arrays.
+    """
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
 
+    include_path = request.args.get('include_path', 'true').lower() != 'false'
+    page = request.args.get('page')
+    per_page = request.args.get('per_page', '50')
+
+    if page is not None:
+        try:
+            page, per_page = int(page), int(per_page)
+        except ValueError:
+            return jsonify({"error": "page and per_page must be integers"}), 400
+    if page is not None and (page < 1 or not 1 <= per_page <= 200):
+        return jsonify({"error": "page must be >= 1 and per_page between 1 and 200"}), 400
+
     try:
-        tsp_runs = TSPRun.query.filter_by(graph_id=graph.id).all()
-        runs_data = [{
-            "id": run.id,
-            "algorithm": run.algorithm,
-            "path": run.path,
-            "cost": run.cost,
-            "time_to_calculate": run.time_to_calculate,
-            "created_at": run.created_at
-        } for run in tsp_runs]
+        query = TSPRun.query.filter_by(graph_id=graph.id).order_by(TSPRun.id)
+        if not include_path:
+            query = query.options(db.defer(TSPRun.path))
+
+        if page is not None:
+            pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+            tsp_runs = pagination.items
+        else:
+            tsp_runs = query.all()
+
+        runs_data = []
+        for run in tsp_runs:
+            run_data = {
+                "id": run.id,
+                "algorithm": run.algorithm,
+                "cost": run.cost,
+                "time_to_calculate": run.time_to_calculate,
+                "created_at": run.created_at
+            }
+            if include_path:
+                run_data["path"] = run.path
+            runs_data.append(run_data)
+
+        if page is not None:
+            return jsonify({
+                "runs": runs_data,
+                "page": pagination.page,
+                "per_page": pagination.per_page,
+                "total": pagination.total,
+                "pages": pagination.pages
+            }), 200
         return jsonify(runs_data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/api/graphs/<int:graph_id>/tsp/runs/stats', methods=['GET'])
+@jwt_required()
+def get_graph_tsp_run_stats(graph_id):
+    """
+    Get per-algorithm cost and runtime statistics for a graph's TSP runs.
+    Percentiles default to 50,90,95 and can be set with ?percentiles=.
+    """
+    user_id = get_jwt_identity()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
+
+    if not graph:
+        return jsonify({"error": "Graph not found"}), 404
+
+    try:
+        percentiles = sorted({int(p) for p in request.args.get('percentiles', '50,90,95').split(',')})
+    except ValueError:
+        return jsonify({"error": "percentiles must be a comma separated list of integers"}), 400
+    if not all(1 <= p <= 100 for p in percentiles):
+        return jsonify({"error": "percentiles must be between 1 and 100"}), 400
+
+    try:
+        return jsonify({
+            "graph_id": graph.id,
+            "algorithms": TSPRun.stats_by_algorithm(graph.id, percentiles)
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
     
 
 @api_bp.route('/api/graphs/<int:graph_id>/tsp/runs', methods=['DELETE'])
@@ -270,7 +493,7 @@ def get_graph_tsp_runs(graph_id):
 def delete_all_graph_tsp_runs(graph_id):
     """Delete all TSP runs for a specific graph."""
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
@@ -289,7 +512,7 @@ def delete_all_graph_tsp_runs(graph_id):
 def delete_graph_tsp_run(graph_id, run_id):
     """Delete a specific TSP run for a specific graph."""
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
@@ -313,7 +536,7 @@ def delete_graph_tsp_run(graph_id, run_id):
 def get_graph_tsp_run(graph_id, run_id):
     """Get a specific TSP run for a specific graph."""
     user_id = get_jwt_identity()
-    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).first()
+    graph = Graph.query.filter_by(user_id=user_id, id=graph_id).options(db.defer(Graph.data)).first()
 
     if not graph:
         return jsonify({"error": "Graph not found"}), 404
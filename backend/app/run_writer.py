@@ -0,0 +1,159 @@
+"""
+Write path for TSP runs.
+
+TSPRunWriter is a write-behind buffer: requests hand it the run to insert
+and wait on a future, while a background thread commits whatever has queued
+up in one transaction (group commit). A batch is written as soon as the
+thread is free, after waiting at most TSP_RUN_BATCH_DELAY seconds for more
+runs to join it, so latency stays bounded while inserts under load share
+commits. The writer has its own session and connection; a request ends its
+transaction before waiting so it doesn't hold a second pooled connection.
+
+SingleFlight lets identical solve requests that are in flight at the same
+time share one computation (and so one stored run). Callers end their
+transaction before joining a flight, since followers may wait for a whole solve.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+
+from flask import current_app
+
+from app.extensions import db
+from app.models import TSPRun
+
+
+logger = logging.getLogger(__name__)
+
+_writer_lock = threading.Lock()
+
+
+class TSPRunWriter:
+
+    def __init__(self, app, max_batch, max_delay):
+        self.pid = os.getpid()
+        self._app = app
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='tsp-run-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, **values):
+        """Queue a TSPRun insert. The returned future resolves to the new run id once committed."""
+        future = Future()
+        self._queue.put((values, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_delay
+            while len(batch) < self._max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # skip runs whose request already gave up waiting
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        with self._app.app_context():
+            try:
+                self._commit(batch)
+            except Exception:
+                db.session.rollback()
+                if len(batch) == 1:
+                    _, future = batch[0]
+                    logger.exception("Failed to store TSP run")
+                    future.set_exception(RuntimeError("Failed to store TSP run"))
+                else:
+                    # don't let one bad row fail the whole batch
+                    for item in batch:
+                        self._write([item])
+            finally:
+                db.session.remove()
+
+    def _commit(self, batch):
+        runs = [TSPRun(**values) for values, _ in batch]
+        db.session.add_all(runs)
+        db.session.flush()
+        # read the ids before commit expires the objects
+        run_ids = [run.id for run in runs]
+        db.session.commit()
+        for run_id, (_, future) in zip(run_ids, batch):
+            future.set_result(run_id)
+
+
+def get_run_writer():
+    """The current process's writer for the app, started on first use (and again after a fork)."""
+    app = current_app._get_current_object()
+    with _writer_lock:
+        writer = app.extensions.get('tsp_run_writer')
+        if writer is None or writer.pid != os.getpid():
+            writer = TSPRunWriter(app, app.config['TSP_RUN_BATCH_SIZE'], app.config['TSP_RUN_BATCH_DELAY'])
+            app.extensions['tsp_run_writer'] = writer
+        return writer
+
+
+def store_tsp_run(**values):
+    """
+    Insert a TSPRun and return its id, through the writer if TSP_RUN_WRITE_BEHIND
+    is on, in which case the caller's session is committed first.
+    """
+    if current_app.config['TSP_RUN_WRITE_BEHIND']:
+        # release the request's connection while the writer uses its own
+        db.session.commit()
+        future = get_run_writer().submit(**values)
+        try:
+            return future.result(timeout=current_app.config['TSP_RUN_WRITE_TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            raise RuntimeError("Timed out storing TSP run")
+
+    tsp_run = TSPRun(**values)
+    db.session.add(tsp_run)
+    db.session.commit()
+    return tsp_run.id
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers with the same key share its result."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """
+        Return (result, shared), where shared is True if another caller did the work.
+        A caller that waits on another's call raises TimeoutError after timeout seconds.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        try:
+            return future.result(timeout=None if leader else timeout), not leader
+        except TimeoutError:
+            raise TimeoutError("Timed out waiting for an identical request in flight")
+
+
+tsp_solves = SingleFlight()
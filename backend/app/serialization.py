@@ -0,0 +1,83 @@
+"""
+JSON serialization for API responses.
+
+FastJSONProvider uses orjson when it is installed and falls back to Flask's
+standard library provider otherwise, or for values orjson can't encode.
+Datetimes still go through Flask's default handler so timestamps keep their
+HTTP date format. Only encoding uses orjson: request bodies are still parsed
+by the standard library, because orjson decodes integers wider than 64 bits
+as floats and rejects NaN and Infinity, which the API has always accepted.
+
+Clients that send Accept: application/vnd.graphworks.compact+json get graph
+payloads in a columnar form, e.g. edges as {"from": [...], "to": [...],
+"weight": [...]} instead of one object per edge.
+"""
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+COMPACT_MIMETYPE = 'application/vnd.graphworks.compact+json'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+
+    def _orjson_options(self, sort_keys, indent):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _orjson_dumps(self, obj, sort_keys, indent):
+        """Encode with orjson, returning None if it can't handle the value."""
+        if orjson is None:
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options(sort_keys, indent))
+        except TypeError:
+            # e.g. integers wider than 64 bits
+            return None
+
+    def dumps(self, obj, **kwargs):
+        # orjson only covers the options Flask itself passes
+        if kwargs.keys() <= {'sort_keys', 'indent', 'separators'}:
+            encoded = self._orjson_dumps(obj, kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+            if encoded is not None:
+                return encoded.decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        # skip the bytes -> str -> bytes round trip of the default implementation
+        encoded = self._orjson_dumps(obj, self.sort_keys, indent)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded + b'\n', mimetype=self.mimetype)
+
+
+def wants_compact():
+    """True if the client prefers the compact columnar format over plain JSON."""
+    return request.accept_mimetypes.best_match(['application/json', COMPACT_MIMETYPE]) == COMPACT_MIMETYPE
+
+
+def to_columns(rows):
+    """Turn a list of dicts into a dict of parallel lists; missing keys become None."""
+    keys = dict.fromkeys(key for row in rows for key in row)
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def compact_graph(graph_data):
+    """Graph JSON with nodes and edges as parallel arrays."""
+    return {
+        **graph_data,
+        'nodes': to_columns(graph_data.get('nodes', [])),
+        'edges': to_columns(graph_data.get('edges', [])),
+    }
@@ -0,0 +1,138 @@
+"""
+Materialized graph summaries.
+
+Summary metrics (see utils.graph_summary) are written to dedicated Graph
+columns whenever a graph's data changes. Small graphs are summarized inline
+before the commit; large graphs are summarized by a background worker after
+the commit so the request isn't held up.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+from app.extensions import db
+from app.models import Graph
+
+
+logger = logging.getLogger(__name__)
+
+# A single worker keeps jobs for the same graph in submission order.
+# Created lazily so each forked server process gets its own thread.
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='graph-summary')
+        return _executor
+
+
+def _apply(graph, summary):
+    for field in Graph.SUMMARY_FIELDS:
+        setattr(graph, field, summary[field] if summary else None)
+
+
+def validate_graph_data(graph_data):
+    """Return an error message if graph_data can't be summarized, else None."""
+    if not isinstance(graph_data, dict):
+        return "Graph 'data' must be an object"
+    if not isinstance(graph_data.get('nodes', []), list) or not isinstance(graph_data.get('edges', []), list):
+        return "Graph 'nodes' and 'edges' must be lists"
+    for node in graph_data.get('nodes', []):
+        if not isinstance(node, dict):
+            return "Each node must be an object"
+        if 'label' in node and not isinstance(node['label'], (str, int)):
+            return "Node labels must be strings or integers"
+    for edge in graph_data.get('edges', []):
+        if not isinstance(edge, dict) or not {'from', 'to', 'weight'} <= edge.keys():
+            return "Each edge must have 'from', 'to' and 'weight'"
+        if not all(isinstance(edge[key], (str, int)) for key in ('from', 'to')):
+            return "Edge endpoints must be strings or integers"
+        if isinstance(edge['weight'], bool) or not isinstance(edge['weight'], (int, float)):
+            return "Edge weights must be numbers"
+    return None
+
+
+def update_graph_summary(graph):
+    """
+    Refresh the summary columns of a graph whose data has changed.
+    Returns True if the summary was computed inline. Otherwise the columns are
+    cleared and the caller must call schedule_graph_summary after committing.
+    """
+    import app.utils as utils
+
+    edges = graph.data.get('edges', [])
+    if len(edges) <= current_app.config['GRAPH_SUMMARY_SYNC_MAX_EDGES']:
+        _apply(graph, utils.graph_summary(graph.data))
+        return True
+
+    _apply(graph, None)
+    return False
+
+
+def schedule_graph_summary(graph_id):
+    """Summarize a committed graph on the background worker."""
+    app = current_app._get_current_object()
+    return _get_executor().submit(_summarize_in_background, app, graph_id)
+
+
+def _summarize_in_background(app, graph_id):
+    import app.utils as utils
+
+    with app.app_context():
+        try:
+            graph = db.session.get(Graph, graph_id)
+            if graph is None:
+                return
+            data = graph.data
+            graph_summary = utils.graph_summary(data)
+            db.session.rollback()
+
+            # Only write if the data is still what was summarized. A newer update
+            # has either stored its own summary inline or scheduled another job.
+            graph = Graph.query.filter_by(id=graph_id).with_for_update().first()
+            if graph is None or graph.data != data:
+                db.session.rollback()
+                return
+            _apply(graph, graph_summary)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Failed to summarize graph %s", graph_id)
+        finally:
+            db.session.remove()
+
+
+@click.command('summarize-graphs')
+@click.option('--all', 'recompute_all', is_flag=True, help='Recompute every summary, not just missing ones.')
+@with_appcontext
+def summarize_graphs_command(recompute_all):
+    """Compute summaries for existing graphs, e.g. after adding the summary columns."""
+    import app.utils as utils
+
+    query = Graph.query.with_entities(Graph.id)
+    if not recompute_all:
+        query = query.filter(Graph.node_count.is_(None))
+    graph_ids = [row.id for row in query.order_by(Graph.id).all()]
+
+    failed = 0
+    for graph_id in graph_ids:
+        graph = db.session.get(Graph, graph_id)
+        error = validate_graph_data(graph.data)
+        if error:
+            failed += 1
+            click.echo(f"Skipping graph {graph_id}: {error}")
+        else:
+            _apply(graph, utils.graph_summary(graph.data))
+            db.session.commit()
+        # keep the identity map from holding every edge blob
+        db.session.expunge_all()
+
+    click.echo(f"Summarized {len(graph_ids) - failed} of {len(graph_ids)} graphs.")
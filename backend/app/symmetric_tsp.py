@@ -0,0 +1,245 @@
+"""
+TSP engine for symmetric graphs (every edge has a reverse edge of equal weight).
+
+On symmetric inputs the metric closure is symmetric too, so only its upper
+triangle is stored, as a condensed array in the same order as
+scipy.spatial.distance.squareform. Symmetric-only heuristics (Christofides,
+2-opt segment reversal) are valid here and much cheaper than their directed
+counterparts. Simulated annealing and threshold accepting follow the networkx
+schedules, but score each move from the edges it changes instead of re-summing
+the whole cycle.
+"""
+import math
+import random
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import dijkstra
+
+
+class SymmetricClosure:
+    """All-pairs shortest path lengths of a symmetric graph, upper triangle only."""
+
+    def __init__(self, graph, chunk_size=64):
+        self.nodes = list(graph.nodes)
+        self.n = n = len(self.nodes)
+
+        idx = np.arange(n, dtype=np.int64)
+        # offset of row i in the condensed array
+        self._offsets = idx * n - idx * (idx + 1) // 2
+        self.condensed = np.empty(n * (n - 1) // 2, dtype=np.float64)
+
+        matrix = nx.to_scipy_sparse_array(graph, nodelist=self.nodes, weight='weight', format='csr')
+        # run the searches in chunks so the full n x n matrix never exists at once
+        for start in range(0, n, chunk_size):
+            rows = dijkstra(matrix, directed=False, indices=idx[start:start + chunk_size])
+            for i, row in enumerate(rows, start):
+                begin = self._offsets[i]
+                self.condensed[begin:begin + n - i - 1] = row[i + 1:]
+
+    def pair(self, u, v):
+        """Distances between index arrays u and v (u != v elementwise)."""
+        lo = np.minimum(u, v)
+        hi = np.maximum(u, v)
+        return self.condensed[self._offsets[lo] + hi - lo - 1]
+
+    def row(self, i):
+        """Distances from index i to every node."""
+        out = np.empty(self.n, dtype=np.float64)
+        before = np.arange(i)
+        out[:i] = self.condensed[self._offsets[before] + i - before - 1]
+        out[i] = 0.0
+        begin = self._offsets[i]
+        out[i + 1:] = self.condensed[begin:begin + self.n - i - 1]
+        return out
+
+    def lookup(self):
+        """A plain function dist(i, j) for i != j, faster than pair() for single lookups."""
+        condensed = self.condensed.tolist()
+        offsets = self._offsets.tolist()
+
+        def dist(i, j):
+            if i > j:
+                i, j = j, i
+            return condensed[offsets[i] + j - i - 1]
+        return dist
+
+    def tour_cost(self, tour):
+        tour = np.asarray(tour)
+        return float(self.pair(tour, np.roll(tour, -1)).sum())
+
+    def to_complete_graph(self):
+        """Complete undirected nx.Graph over the closure, half the edges of the directed one."""
+        i, j = np.triu_indices(self.n, k=1)
+        G = nx.Graph()
+        G.add_weighted_edges_from(
+            (self.nodes[a], self.nodes[b], w)
+            for a, b, w in zip(i.tolist(), j.tolist(), self.condensed.tolist())
+        )
+        return G
+
+    def to_cycle(self, tour):
+        """Convert a tour of indices to a closed cycle of node labels."""
+        cycle = [self.nodes[k] for k in tour]
+        return cycle + cycle[:1]
+
+
+def nearest_neighbor_tour(closure, start=0):
+    """Same construction as nx.approximation.greedy_tsp, on the condensed closure."""
+    visited = np.zeros(closure.n, dtype=bool)
+    visited[start] = True
+    tour = [start]
+    current = start
+    for _ in range(closure.n - 1):
+        dist = closure.row(current)
+        dist[visited] = np.inf
+        current = int(np.argmin(dist))
+        visited[current] = True
+        tour.append(current)
+    return tour
+
+
+def two_opt(closure, tour, max_passes=50):
+    """
+    Improve a tour by reversing segments while that shortens it.
+    Only valid for symmetric distances, since a reversed segment is
+    assumed to cost the same in both directions.
+    """
+    tour = np.array(tour, dtype=np.int64)
+    n = len(tour)
+    if n < 4:
+        return tour.tolist()
+
+    lengths = closure.pair(tour, np.roll(tour, -1))
+    for _ in range(max_passes):
+        improved = False
+        for i in range(n - 2):
+            # for i == 0 the last edge shares node tour[0], so skip it
+            js = np.arange(i + 2, n if i > 0 else n - 1)
+            if len(js) == 0:
+                continue
+            c = tour[js]
+            d = tour[(js + 1) % n]
+            delta = closure.row(tour[i])[c] + closure.row(tour[i + 1])[d] - lengths[i] - lengths[js]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = js[best]
+                tour[i + 1:j + 1] = tour[i + 1:j + 1][::-1]
+                lengths = closure.pair(tour, np.roll(tour, -1))
+                improved = True
+        if not improved:
+            break
+    return tour.tolist()
+
+
+def _swap_delta(dist, tour, a, b):
+    """Change in tour cost from swapping the nodes at positions 0 < a < b."""
+    x, y = tour[a], tour[b]
+    before, after = tour[a - 1], tour[(b + 1) % len(tour)]
+    if b == a + 1:
+        return dist(before, y) + dist(x, after) - dist(before, x) - dist(y, after)
+    x_next, y_prev = tour[a + 1], tour[b - 1]
+    return (dist(before, y) + dist(y, x_next) + dist(y_prev, x) + dist(x, after)
+            - dist(before, x) - dist(x, x_next) - dist(y_prev, y) - dist(y, after))
+
+
+def _swap_moves(closure, tour, accept, cool, max_iterations, n_inner, seed):
+    """
+    Local search with the '1-1' swap move of nx.approximation's annealing
+    methods: the first node stays put and two others trade places. accept(delta)
+    decides whether to take a move; cool(accepted) is called after each inner
+    loop and returns False to stop. Stops after max_iterations outer loops
+    without a new best tour.
+    """
+    tour = list(tour)
+    n = len(tour)
+    if n < 4:
+        # every order of three nodes costs the same
+        return tour
+
+    rng = random.Random(seed)
+    rand = rng.random
+    dist = closure.lookup()
+    cost = best_cost = closure.tour_cost(tour)
+    best_tour = tour.copy()
+    count = 0
+    while count <= max_iterations:
+        count += 1
+        accepted = False
+        for _ in range(n_inner):
+            # two distinct positions in 1..n-1, cheaper than rng.sample
+            a = 1 + int(rand() * (n - 1))
+            b = 1 + int(rand() * (n - 2))
+            if b >= a:
+                b += 1
+            else:
+                a, b = b, a
+            delta = _swap_delta(dist, tour, a, b)
+            if accept(delta, rng):
+                accepted = True
+                tour[a], tour[b] = tour[b], tour[a]
+                cost += delta
+                # the tolerance keeps rounding in the running cost from counting as progress
+                if cost < best_cost - 1e-9:
+                    count = 0
+                    best_tour = tour.copy()
+                    best_cost = cost
+        if not cool(accepted):
+            break
+    return best_tour
+
+
+def simulated_annealing(closure, tour, temp=100, alpha=0.01, max_iterations=500, n_inner=100, seed=None):
+    """Same parameters and schedule as nx.approximation.simulated_annealing_tsp."""
+    state = {'temp': temp}
+
+    def accept(delta, rng):
+        return delta <= 0 or math.exp(-delta / state['temp']) >= rng.random()
+
+    def cool(accepted):
+        state['temp'] -= state['temp'] * alpha
+        return state['temp'] > 0
+
+    return _swap_moves(closure, tour, accept, cool, max_iterations, n_inner, seed)
+
+
+def threshold_accepting(closure, tour, threshold=1, alpha=0.1, max_iterations=500, n_inner=100, seed=None):
+    """Same parameters and schedule as nx.approximation.threshold_accepting_tsp."""
+    state = {'threshold': threshold}
+
+    def accept(delta, rng):
+        return delta <= state['threshold']
+
+    def cool(accepted):
+        if accepted:
+            state['threshold'] -= state['threshold'] * alpha
+        return True
+
+    return _swap_moves(closure, tour, accept, cool, max_iterations, n_inner, seed)
+
+
+def traveling_salesman_cycle(graph, method='greedy', init_order=None):
+    """
+    Solve TSP on a symmetric graph, returning a closed cycle over all nodes.
+    init_order, a node order, replaces the nearest neighbour starting tour
+    of the improvement methods.
+    """
+    closure = SymmetricClosure(graph)
+    if init_order is None:
+        start_tour = nearest_neighbor_tour(closure)
+    else:
+        index = {node: i for i, node in enumerate(closure.nodes)}
+        start_tour = [index[node] for node in init_order]
+
+    if method == 'greedy':
+        return closure.to_cycle(start_tour)
+    elif method == 'two_opt':
+        return closure.to_cycle(two_opt(closure, start_tour))
+    elif method == 'christofides':
+        return nx.approximation.christofides(closure.to_complete_graph(), weight='weight')
+    elif method == 'simulated_annealing':
+        return closure.to_cycle(simulated_annealing(closure, start_tour))
+    elif method == 'threshold_accepting':
+        return closure.to_cycle(threshold_accepting(closure, start_tour))
+    else:
+        raise ValueError("Invalid symmetric TSP method. Choose 'greedy', 'two_opt', 'christofides', 'simulated_annealing', or 'threshold_accepting'.")
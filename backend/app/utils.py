@@ -1,5 +1,49 @@
+import heapq
+import itertools
+import math
+
 import networkx as nx
 
+import app.symmetric_tsp as symmetric_tsp
+
+
+def build_digraph(graph_data):
+    """Build a weighted DiGraph from the stored graph JSON."""
+    G = nx.DiGraph()
+    G.add_weighted_edges_from(
+        [(edge['from'], edge['to'], edge['weight']) for edge in graph_data.get('edges', [])]
+    )
+    return G
+
+
+def is_symmetric(graph: nx.DiGraph) -> bool:
+    """Return True if every edge has a reverse edge with the same weight."""
+    for u, v, weight in graph.edges(data='weight'):
+        if not graph.has_edge(v, u) or not math.isclose(graph[v][u]['weight'], weight):
+            return False
+    return True
+
+
+def graph_summary(graph_data) -> dict:
+    """
+    Compute size and shape metrics for the stored graph JSON.
+    Nodes listed without edges still count towards node_count.
+    """
+    G = build_digraph(graph_data)
+    G.add_nodes_from(node['label'] for node in graph_data.get('nodes', []) if 'label' in node)
+
+    weights = [weight for _, _, weight in G.edges(data='weight')]
+    return {
+        'node_count': G.number_of_nodes(),
+        'edge_count': G.number_of_edges(),
+        'density': nx.density(G) if G.number_of_nodes() > 1 else 0.0,
+        'weight_min': min(weights) if weights else None,
+        'weight_max': max(weights) if weights else None,
+        'weight_mean': sum(weights) / len(weights) if weights else None,
+        'scc_count': nx.number_strongly_connected_components(G),
+        'is_symmetric': is_symmetric(G),
+    }
+
 
 def find_shortest_path(graph, source, target, algorithm='dijkstra'):
   
@@ -13,26 +57,60 @@ def find_shortest_path(graph, source, target, algorithm='dijkstra'):
         raise ValueError("Invalid algorithm. Choose 'dijkstra', 'astar', or 'bidirectional'.")
 
 
+# Methods that improve a starting tour and can therefore be warm-started
+WARM_START_METHODS = ('simulated_annealing', 'threshold_accepting', 'two_opt')
+# Methods that are only valid when every edge has an equal-weight reverse edge
+SYMMETRIC_ONLY_METHODS = ('two_opt', 'christofides')
+
+
 #Link for traveling_salesman_problem function in NetworkX: https://networkx.org/documentation/stable/reference/algorithms/generated/networkx.algorithms.approximation.traveling_salesman.traveling_salesman_problem.html#networkx.algorithms.approximation.traveling_salesman.traveling_salesman_problem
-def traveling_salesman_path(graph, method='greedy'):
-   
+def traveling_salesman_path(graph, method='greedy', symmetric=None, init_order=None):
+    """
+    Symmetric graphs are solved by the undirected engine in app.symmetric_tsp,
+    except with 'asadpour', which is a directed algorithm and always runs on
+    the directed closure. symmetric is detected from the graph unless given.
+    init_order is an optional Hamiltonian node order (see compress_tour) used
+    instead of the greedy tour to seed the WARM_START_METHODS.
+    """
+    if init_order is not None:
+        if method not in WARM_START_METHODS:
+            raise ValueError(f"Method '{method}' can't be warm-started. Choose one of {', '.join(WARM_START_METHODS)}.")
+        if len(init_order) != graph.number_of_nodes() or set(init_order) != set(graph.nodes):
+            raise ValueError("The warm start tour must visit every node of the graph exactly once.")
+
+    if symmetric is None:
+        symmetric = is_symmetric(graph)
+    if symmetric and method != 'asadpour':
+        return reconstruct_path(graph, symmetric_tsp.traveling_salesman_cycle(graph, method, init_order))
+
+    init_cycle = "greedy" if init_order is None else list(init_order) + [init_order[0]]
+
     c_graph = complete_graph(graph)
     #DON'T use greedy when the graph was orgnially in-complete
     if method == 'greedy':
         tsp_path = nx.approximation.greedy_tsp(c_graph, weight="weight")
     elif method == 'simulated_annealing':
-        tsp_path = nx.approximation.simulated_annealing_tsp(c_graph, init_cycle="greedy",  weight="weight", max_iterations=500)
+        tsp_path = nx.approximation.simulated_annealing_tsp(c_graph, init_cycle=init_cycle,  weight="weight", max_iterations=500)
     elif method == 'threshold_accepting':
-        tsp_path = nx.approximation.threshold_accepting_tsp(c_graph, init_cycle="greedy",weight="weight",max_iterations=500)
+        tsp_path = nx.approximation.threshold_accepting_tsp(c_graph, init_cycle=init_cycle,weight="weight",max_iterations=500)
     elif method == 'asadpour':
         tsp_path = nx.approximation.traveling_salesman_problem(c_graph, weight='weight', cycle=True)
     else:
-        raise ValueError("Invalid TSP method. Choose 'greedy', 'simulated_annealing', 'threshold_accepting', or 'asadpour'.")
+        raise ValueError("Invalid TSP method. Choose 'greedy', 'simulated_annealing', 'threshold_accepting', or 'asadpour'. "
+                         "'two_opt' and 'christofides' require a symmetric graph.")
 
     real_path = reconstruct_path(graph,tsp_path)
     return real_path
 
 
+def compress_tour(path):
+    """
+    Reduce a closed walk, such as a stored reconstruct_path result that
+    repeats intermediate nodes, to the order in which it first visits each node.
+    """
+    return list(dict.fromkeys(path))
+
+
 def complete_graph(graph):
     nodes = list(graph.nodes)
     complete_graph = graph.copy()
@@ -67,6 +145,93 @@ def reconstruct_path(graph, tsp_path):
     return real_path
 
 
+def _dijkstra_to_targets(graph, source, targets):
+    """
+    Single-source Dijkstra that stops as soon as every target is settled.
+    Returns (dist, pred) restricted to the settled nodes.
+    """
+    remaining = set(targets)
+    remaining.discard(source)
+    dist = {}
+    pred = {source: None}
+    tentative = {source: 0.0}
+    counter = itertools.count()  # tie-breaker so node labels are never compared
+    heap = [(0.0, next(counter), source)]
+
+    while heap and remaining:
+        d, _, u = heapq.heappop(heap)
+        if u in dist:
+            continue
+        dist[u] = d
+        remaining.discard(u)
+        for v, attrs in graph[u].items():
+            new_dist = d + attrs['weight']
+            if v not in dist and new_dist < tentative.get(v, math.inf):
+                tentative[v] = new_dist
+                pred[v] = u
+                heapq.heappush(heap, (new_dist, next(counter), v))
+
+    dist.setdefault(source, 0.0)
+    return dist, pred
+
+
+def _walk_back(pred, source, target):
+    path = [target]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    return path[::-1]
+
+
+def terminal_distance_matrix(graph, terminals, with_paths=False):
+    """
+    Shortest path lengths between a subset of nodes, as a k x k matrix in the
+    order of terminals. Runs one early-terminating search per terminal
+    instead of all-pairs Dijkstra over every node. Unreachable pairs are None.
+    If with_paths is True, also returns a matching matrix of node paths.
+    """
+    distances = []
+    paths = []
+    for source in terminals:
+        dist, pred = _dijkstra_to_targets(graph, source, terminals)
+        distances.append([dist.get(target) for target in terminals])
+        if with_paths:
+            paths.append([
+                _walk_back(pred, source, target) if target in dist else None
+                for target in terminals
+            ])
+
+    if with_paths:
+        return distances, paths
+    return distances
+
+
+def terminal_tsp_path(graph, terminals, method='greedy'):
+    """
+    Find a closed walk in graph that visits every terminal, possibly passing
+    through other nodes. The TSP is solved on the complete graph over the
+    terminals and the result is expanded back into graph edges.
+    Raises a ValueError if some terminal cannot reach another.
+    """
+    distances, paths = terminal_distance_matrix(graph, terminals, with_paths=True)
+
+    T = nx.DiGraph()
+    for i, source in enumerate(terminals):
+        for j, target in enumerate(terminals):
+            if i == j:
+                continue
+            if distances[i][j] is None:
+                raise ValueError(f"Terminal {target} is not reachable from {source}.")
+            T.add_edge(source, target, weight=distances[i][j])
+
+    cycle = traveling_salesman_path(T, method)
+
+    index = {terminal: i for i, terminal in enumerate(terminals)}
+    real_path = [cycle[0]]
+    for u, v in zip(cycle, cycle[1:]):
+        real_path.extend(paths[index[u]][index[v]][1:])
+    return real_path
+
+
 def get_path_cost(graph: nx.Graph, path: list) -> float:
     """
     Given a graph and a path, return the total cost of the path.
@@ -0,0 +1,30 @@
+"""
+Guard for benchmarks that create and drop their own tables.
+
+The benchmarks default to a temporary SQLite file. When --database-url points
+somewhere else, they only run against an empty database, unless
+--drop-existing says its tables may be dropped.
+"""
+import sys
+
+from sqlalchemy import create_engine, inspect
+
+
+def add_database_arguments(parser):
+    parser.add_argument('--database-url', default=None,
+                        help='empty database to run against (default: temporary SQLite file)')
+    parser.add_argument('--drop-existing', action='store_true',
+                        help='allow dropping the tables of a non-empty --database-url')
+
+
+def check_database(database_url, drop_existing):
+    """Exit if the database already has tables and dropping them wasn't allowed."""
+    engine = create_engine(database_url)
+    try:
+        tables = inspect(engine).get_table_names()
+    finally:
+        engine.dispose()
+    if tables and not drop_existing:
+        sys.exit(f"Refusing to run against {engine.url.render_as_string(hide_password=True)}: "
+                 f"it already has tables ({', '.join(sorted(tables))}) that this benchmark would drop. "
+                 f"Use an empty database or pass --drop-existing.")
@@ -0,0 +1,193 @@
+"""
+Load test for the hot graph / TSP run queries used by the API routes.
+
+Seeds a database with users, graphs and TSP runs, then times the lookups
+the routes perform with and without the composite indexes and deferred
+column loading. Uses a temporary SQLite file unless --database-url points
+at an empty Postgres database (see benchmarks.database).
+
+Both scenarios get a discarded warm-up pass, then run --rounds times in
+alternating order, so neither one is always measured on a cold cache.
+
+Usage (from the backend directory):
+    python -m benchmarks.db_load_test --users 20 --graphs-per-user 10 --runs-per-graph 20
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Graph, TSPRun
+from benchmarks.database import add_database_arguments, check_database
+
+
+def make_graph_data(num_nodes):
+    nodes = [{"id": i, "label": str(i)} for i in range(num_nodes)]
+    edges = [
+        {"from": u, "to": v, "weight": random.uniform(1, 10)}
+        for u in range(num_nodes) for v in range(num_nodes) if u != v
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+def seed(num_users, graphs_per_user, runs_per_graph, num_nodes):
+    graph_data = make_graph_data(num_nodes)
+    path = list(range(num_nodes)) + [0]
+
+    users = [{"username": f"load_user_{i}", "password_hash": "x"} for i in range(num_users)]
+    db.session.execute(db.insert(User), users)
+    user_ids = [row.id for row in User.query.with_entities(User.id).all()]
+
+    graphs = [
+        {"name": f"graph_{u}_{g}", "user_id": u, "data": graph_data}
+        for u in user_ids for g in range(graphs_per_user)
+    ]
+    db.session.execute(db.insert(Graph), graphs)
+    graph_rows = Graph.query.with_entities(Graph.id, Graph.user_id).all()
+
+    runs = [
+        {
+            "graph_id": graph.id,
+            "algorithm": "greedy",
+            "path": path,
+            "cost": random.uniform(10, 100),
+            "time_to_calculate": random.uniform(0.01, 1),
+        }
+        for graph in graph_rows for _ in range(runs_per_graph)
+    ]
+    db.session.execute(db.insert(TSPRun), runs)
+    db.session.commit()
+    return [(graph.user_id, graph.id) for graph in graph_rows]
+
+
+# name -> (indexes, deferred blobs)
+SCENARIOS = {
+    'baseline': (False, False),
+    'tuned': (True, True),
+}
+
+
+def time_query(fn, targets, repeat):
+    samples = []
+    for _ in range(repeat):
+        user_id, graph_id = random.choice(targets)
+        start = time.perf_counter()
+        fn(user_id, graph_id)
+        samples.append((time.perf_counter() - start) * 1000)
+        db.session.remove()
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p95": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def run_scenario(targets, repeat, deferred):
+    graph_options = [db.defer(Graph.data)] if deferred else []
+
+    def graph_list(user_id, graph_id):
+        if deferred:
+            return Graph.query.filter_by(user_id=user_id).with_entities(Graph.id).all()
+        return Graph.query.filter_by(user_id=user_id).all()
+
+    def owned_graph(user_id, graph_id):
+        return Graph.query.filter_by(user_id=user_id, id=graph_id).options(*graph_options).first()
+
+    def graph_runs(user_id, graph_id):
+        graph = owned_graph(user_id, graph_id)
+        return TSPRun.query.filter_by(graph_id=graph.id).all()
+
+    return {
+        "GET /api/graphs": time_query(graph_list, targets, repeat),
+        "graph ownership check": time_query(owned_graph, targets, repeat),
+        "GET /api/graphs/<id>/tsp/runs": time_query(graph_runs, targets, repeat),
+    }
+
+
+def set_indexes(enabled):
+    indexes = list(Graph.__table__.indexes) + list(TSPRun.__table__.indexes)
+    for index in indexes:
+        index.drop(db.engine, checkfirst=True)
+        if enabled:
+            index.create(db.engine)
+
+
+def run_rounds(targets, repeat, rounds):
+    """Samples per scenario and query, over rounds that alternate which scenario goes first."""
+    samples = {name: {} for name in SCENARIOS}
+    names = list(SCENARIOS)
+    # warm-up round, not recorded
+    for name in names:
+        indexed, deferred = SCENARIOS[name]
+        set_indexes(indexed)
+        run_scenario(targets, min(repeat, 50), deferred)
+
+    for round_index in range(rounds):
+        for name in (names if round_index % 2 == 0 else names[::-1]):
+            indexed, deferred = SCENARIOS[name]
+            set_indexes(indexed)
+            for query, query_samples in run_scenario(targets, repeat, deferred).items():
+                samples[name].setdefault(query, []).extend(query_samples)
+    return {name: {query: summarize(s) for query, s in queries.items()} for name, queries in samples.items()}
+
+
+def print_report(name, results):
+    print(f"\n{name}")
+    print(f"  {'query':<32}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for query, stats in results.items():
+        print(f"  {query:<32}{stats['mean']:>10.3f}{stats['p50']:>10.3f}{stats['p95']:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--graphs-per-user', type=int, default=10)
+    parser.add_argument('--runs-per-graph', type=int, default=20)
+    parser.add_argument('--nodes', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=300, help='queries per scenario and round')
+    parser.add_argument('--rounds', type=int, default=2)
+    args = parser.parse_args()
+
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        database_url = 'sqlite:///' + os.path.join(tmp_dir.name, 'load_test.db')
+    check_database(database_url, args.drop_existing)
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        targets = seed(args.users, args.graphs_per_user, args.runs_per_graph, args.nodes)
+        print(f"Seeded {len(targets)} graphs with {args.runs_per_graph} runs each on {db.engine.url.drivername}")
+
+        results = run_rounds(targets, args.repeat, args.rounds)
+        baseline, tuned = results['baseline'], results['tuned']
+
+        print_report("Baseline (no indexes, full rows)", baseline)
+        print_report("Tuned (composite indexes, deferred blobs)", tuned)
+        print("\nSpeedup (mean)")
+        for query in baseline:
+            print(f"  {query:<32}{baseline[query]['mean'] / tuned[query]['mean']:>10.2f}x")
+
+        db.session.remove()
+        db.drop_all()
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+"""
+Load test and latency SLO report for the whole API.
+
+Starts the app under gunicorn against a temporary SQLite database (or
+--database-url), or targets an already running server with --url. Each
+virtual user replays a realistic session:
+
+    register, login
+    upload the SampleGraphs CSVs and a symmetrized copy of --symmetric ones,
+    list graphs, fetch each graph
+    run every TSP algorithm on each graph (two_opt and christofides only on
+    symmetric ones), then warm-started runs from the best and a stored run
+    terminal distances (with and without paths) and a terminal TSP tour
+    list runs and run stats
+    delete one run, delete all runs, delete the graphs and the user
+
+The report gives p50/p95/p99 latency, errors and throughput per endpoint,
+plus CPU time and peak RSS of the server process tree (sampled from /proc,
+so only available on Linux for a server this tool started or --server-pid).
+RSS is summed over the processes, so pages the workers share copy-on-write
+with the gunicorn master are counted once per process.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test --users 8 --iterations 3 --workers 2 --threads 4
+    python -m benchmarks.load_test --url http://127.0.0.1:5000 --server-pid 1234
+"""
+
+import argparse
+import csv
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+
+from app import create_app
+from app.extensions import db
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_GRAPHS_DIR = os.path.join(os.path.dirname(BACKEND_DIR), 'SampleGraphs')
+ALGORITHMS = ['greedy', 'simulated_annealing', 'threshold_accepting', 'asadpour', 'two_opt', 'christofides']
+SYMMETRIC_ONLY_ALGORITHMS = ('two_opt', 'christofides')
+WARM_START_ALGORITHMS = ('simulated_annealing', 'threshold_accepting', 'two_opt')
+NUM_TERMINALS = 4
+
+
+def load_csv_graph(path):
+    """Parse a SampleGraphs CSV the same way the GraphBuilder frontend does."""
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+
+    nodes = []
+    edges = {}
+    for row in rows:
+        source, target = row.get('From'), row.get('To')
+        if not source or not target:
+            continue
+        for node in (source, target):
+            if node not in nodes:
+                nodes.append(node)
+        edges.setdefault((source, target), float(row.get('Cost') or 1))
+
+    return {
+        'nodes': [{'label': node} for node in nodes],
+        'edges': [{'from': u, 'to': v, 'weight': w} for (u, v), w in edges.items()],
+    }
+
+
+def symmetrize(graph_data):
+    """Give every edge a reverse edge of the same weight, the lower one where both directions exist."""
+    weights = {}
+    for edge in graph_data['edges']:
+        key = tuple(sorted((edge['from'], edge['to'])))
+        weights[key] = min(weights.get(key, edge['weight']), edge['weight'])
+    edges = []
+    for (u, v), weight in weights.items():
+        edges += [{'from': u, 'to': v, 'weight': weight}, {'from': v, 'to': u, 'weight': weight}]
+    return {'nodes': graph_data['nodes'], 'edges': edges}
+
+
+class Recorder:
+    """Thread-safe latency samples per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+class Client:
+
+    def __init__(self, base_url, recorder, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.token = None
+
+    def request(self, method, path, endpoint, body=None, expected=(200,)):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header('Content-Type', 'application/json')
+        if self.token:
+            req.add_header('Authorization', f'Bearer {self.token}')
+
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                status, payload = response.status, response.read()
+        except urllib.error.HTTPError as e:
+            status, payload = e.code, e.read()
+        except (urllib.error.URLError, socket.timeout, ConnectionError):
+            status, payload = None, b''
+        self.recorder.record(endpoint, time.perf_counter() - start, status in expected)
+
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+
+def run_session(client, graphs, algorithms, asadpour_max_nodes):
+    username = f'load_{uuid.uuid4().hex[:12]}'
+    client.request('POST', '/api/register', 'POST /api/register',
+                   {'username': username, 'password': 'load-test'}, expected=(201,))
+    _, login = client.request('POST', '/api/login', 'POST /api/login',
+                              {'username': username, 'password': 'load-test'})
+    if not login or 'access_token' not in login:
+        return
+    client.token = login['access_token']
+
+    uploaded = []
+    for name, data, symmetric in graphs:
+        _, created = client.request('POST', '/api/graphs', 'POST /api/graphs',
+                                    {'name': name, 'data': data}, expected=(201,))
+        if created and 'graph_id' in created:
+            uploaded.append((created['graph_id'], data, symmetric))
+
+    client.request('GET', '/api/graphs', 'GET /api/graphs')
+
+    for graph_id, data, symmetric in uploaded:
+        base = f'/api/graphs/{graph_id}'
+        client.request('GET', base, 'GET /api/graphs/<id>')
+
+        graph_algorithms = [
+            algo for algo in algorithms
+            if (symmetric or algo not in SYMMETRIC_ONLY_ALGORITHMS)
+            and (algo != 'asadpour' or len(data['nodes']) <= asadpour_max_nodes)
+        ]
+        for algo in graph_algorithms:
+            client.request('GET', f'{base}/tsp?algo={algo}', f'GET /tsp [{algo}]')
+
+        _, runs = client.request('GET', f'{base}/tsp/runs', 'GET /tsp/runs')
+        for algo in graph_algorithms:
+            if algo in WARM_START_ALGORITHMS:
+                client.request('GET', f'{base}/tsp?algo={algo}&warm_start=best', f'GET /tsp [{algo}, warm_start=best]')
+                if runs:
+                    client.request('GET', f"{base}/tsp?algo={algo}&warm_start={runs[-1]['id']}",
+                                   f'GET /tsp [{algo}, warm_start=<id>]')
+
+        terminals = [node['label'] for node in data['nodes'][:NUM_TERMINALS]]
+        client.request('POST', f'{base}/distances', 'POST /distances', {'terminals': terminals})
+        client.request('POST', f'{base}/distances', 'POST /distances (paths)', {'terminals': terminals, 'paths': True})
+        client.request('POST', f'{base}/tsp/terminals', 'POST /tsp/terminals', {'terminals': terminals})
+
+        client.request('GET', f'{base}/tsp/runs?page=1&per_page=20&include_path=false', 'GET /tsp/runs (page)')
+        client.request('GET', f'{base}/tsp/runs/stats', 'GET /tsp/runs/stats')
+        if runs:
+            client.request('DELETE', f"{base}/tsp/runs/{runs[0]['id']}", 'DELETE /tsp/runs/<id>')
+        client.request('DELETE', f'{base}/tsp/runs', 'DELETE /tsp/runs')
+        client.request('DELETE', base, 'DELETE /api/graphs/<id>')
+
+    client.request('DELETE', '/api/users', 'DELETE /api/users')
+
+
+class ProcessSampler:
+    """Samples CPU time and RSS of a process and its children from /proc."""
+
+    def __init__(self, pid, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._ticks = os.sysconf('SC_CLK_TCK')
+        self._page_size = os.sysconf('SC_PAGE_SIZE')
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _stat(self, pid):
+        with open(f'/proc/{pid}/stat') as f:
+            # the command name may contain spaces, so split after it
+            fields = f.read().rsplit(')', 1)[1].split()
+        ppid, utime, stime, rss = int(fields[1]), int(fields[11]), int(fields[12]), int(fields[21])
+        return ppid, (utime + stime) / self._ticks, rss * self._page_size
+
+    def snapshot(self):
+        """Total (cpu_seconds, rss_bytes) of the process tree."""
+        stats = {}
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                try:
+                    stats[int(entry)] = self._stat(entry)
+                except (OSError, IndexError, ValueError):
+                    continue
+
+        tree = {self.pid}
+        changed = True
+        while changed:
+            children = {pid for pid, (ppid, _, _) in stats.items() if ppid in tree} - tree
+            tree |= children
+            changed = bool(children)
+
+        cpu = sum(stats[pid][1] for pid in tree if pid in stats)
+        rss = sum(stats[pid][2] for pid in tree if pid in stats)
+        return cpu, rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, self.snapshot()[1])
+
+    def start(self):
+        self.start_cpu, rss = self.snapshot()
+        self.peak_rss = rss
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.snapshot()[0] - self.start_cpu
+
+
+def start_server(database_url, workers, threads, port):
+    # create the schema up front so workers don't race to do it
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'run:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup; is it installed?')
+        try:
+            urllib.request.urlopen(url + '/api/debug/graphs', timeout=1).read()
+            return server, url
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError('gunicorn did not start within 60 seconds')
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def percentile(sorted_samples, p):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(sorted_samples) * p // 100))
+    return sorted_samples[int(rank) - 1]
+
+
+def build_report(recorder, elapsed, server_cpu, peak_rss):
+    endpoints = {}
+    for endpoint, samples in sorted(recorder.latencies.items()):
+        samples = sorted(samples)
+        endpoints[endpoint] = {
+            'count': len(samples),
+            'errors': recorder.errors[endpoint],
+            'p50_ms': percentile(samples, 50) * 1000,
+            'p95_ms': percentile(samples, 95) * 1000,
+            'p99_ms': percentile(samples, 99) * 1000,
+            'rps': len(samples) / elapsed,
+        }
+    total = sum(e['count'] for e in endpoints.values())
+    return {
+        'elapsed_s': elapsed,
+        'requests': total,
+        'errors': sum(e['errors'] for e in endpoints.values()),
+        'rps': total / elapsed,
+        'server_cpu_s': server_cpu,
+        'server_cpu_pct': None if server_cpu is None else server_cpu / elapsed * 100,
+        'server_peak_rss_mb': None if peak_rss is None else peak_rss / 1024 / 1024,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(report):
+    print(f"\n  {'endpoint':<50}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for endpoint, stats in report['endpoints'].items():
+        print(f"  {endpoint:<50}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10.1f}"
+              f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['rps']:>9.1f}")
+    print(f"\n  {report['requests']} requests, {report['errors']} errors in {report['elapsed_s']:.1f}s "
+          f"({report['rps']:.1f} req/s)")
+    if report['server_cpu_s'] is not None:
+        print(f"  server CPU {report['server_cpu_s']:.1f}s ({report['server_cpu_pct']:.0f}% of one core), "
+              f"peak RSS {report['server_peak_rss_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server instead of starting gunicorn')
+    parser.add_argument('--server-pid', type=int, help='process to sample when using --url')
+    parser.add_argument('--database-url', help='database for the started server (default: temporary SQLite file)')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--users', type=int, default=4, help='concurrent virtual users')
+    parser.add_argument('--iterations', type=int, default=2, help='sessions per virtual user')
+    parser.add_argument('--graphs', nargs='+', default=['5nodes.csv', '10nodes.csv'],
+                        help='SampleGraphs CSV files each session uploads')
+    parser.add_argument('--symmetric', nargs='*', default=['10nodes.csv'],
+                        help='SampleGraphs CSV files each session also uploads with every edge made two-way')
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS)
+    parser.add_argument('--asadpour-max-nodes', type=int, default=5,
+                        help='skip asadpour on larger graphs, where it can take minutes')
+    parser.add_argument('--timeout', type=float, default=120, help='per request timeout in seconds')
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args()
+
+    graphs = [(name, load_csv_graph(os.path.join(SAMPLE_GRAPHS_DIR, name)), False) for name in args.graphs]
+    graphs += [(f'{name} (symmetric)', symmetrize(load_csv_graph(os.path.join(SAMPLE_GRAPHS_DIR, name))), True)
+               for name in args.symmetric]
+
+    server = None
+    tmp_dir = None
+    server_pid = args.server_pid
+    url = args.url
+    if not url:
+        database_url = args.database_url
+        if not database_url:
+            tmp_dir = tempfile.TemporaryDirectory()
+            database_url = 'sqlite:///' + os.path.join(tmp_dir.name, 'load_test.db')
+        server, url = start_server(database_url, args.workers, args.threads, free_port())
+        server_pid = server.pid
+        print(f"Started gunicorn with {args.workers} workers x {args.threads} threads on {url}")
+
+    sampler = ProcessSampler(server_pid) if server_pid and os.path.isdir('/proc') else None
+    recorder = Recorder()
+
+    def virtual_user():
+        for _ in range(args.iterations):
+            run_session(Client(url, recorder, args.timeout), graphs, args.algorithms, args.asadpour_max_nodes)
+
+    try:
+        if sampler:
+            sampler.start()
+        start = time.perf_counter()
+        users = [threading.Thread(target=virtual_user) for _ in range(args.users)]
+        for user in users:
+            user.start()
+        for user in users:
+            user.join()
+        elapsed = time.perf_counter() - start
+        server_cpu = sampler.stop() if sampler else None
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+    report = build_report(recorder, elapsed, server_cpu, sampler.peak_rss if sampler else None)
+    print(f"{args.users} users x {args.iterations} sessions")
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
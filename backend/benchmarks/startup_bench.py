@@ -0,0 +1,90 @@
+"""
+Startup benchmark for the Flask app factory.
+
+Each sample runs in a fresh interpreter and measures the cold import of
+the app package, create_app, and the latency of the first graph upload
+(which computes its summary) and of the first and second TSP requests, with solvers loaded lazily and with PRELOAD_SOLVERS
+(as gunicorn's pre-fork master does).
+
+Usage (from the backend directory):
+    python -m benchmarks.startup_bench --samples 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+STAGES = ('import', 'create_app', 'first_graph', 'first_tsp', 'second_tsp')
+
+
+def run_child(preload):
+    start = time.perf_counter()
+    from app import create_app
+    from app.extensions import db
+    timings = {'import': time.perf_counter() - start}
+
+    start = time.perf_counter()
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'JWT_SECRET_KEY': 'startup-benchmark-secret-key-0123456789',
+        'PRELOAD_SOLVERS': preload,
+    })
+    timings['create_app'] = time.perf_counter() - start
+
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post('/api/register', json={'username': 'bench', 'password': 'bench'})
+    token = client.post('/api/login', json={'username': 'bench', 'password': 'bench'}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    edges = [{'from': i, 'to': (i + 1) % 5, 'weight': i + 1} for i in range(5)]
+    start = time.perf_counter()
+    graph_id = client.post('/api/graphs', json={'name': 'bench', 'data': {'nodes': [], 'edges': edges}},
+                           headers=headers).get_json()['graph_id']
+    timings['first_graph'] = time.perf_counter() - start
+
+    for stage in ('first_tsp', 'second_tsp'):
+        start = time.perf_counter()
+        response = client.get(f'/api/graphs/{graph_id}/tsp?algo=greedy', headers=headers)
+        timings[stage] = time.perf_counter() - start
+        assert response.status_code == 200, response.get_json()
+
+    print(json.dumps(timings))
+
+
+def sample(preload):
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    args = [sys.executable, '-m', 'benchmarks.startup_bench', '--child']
+    if preload:
+        args.append('--preload')
+    output = subprocess.run(args, cwd=backend_dir, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--preload', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.preload)
+        return
+
+    print(f"Median of {args.samples} fresh interpreters, in ms")
+    print(f"  {'mode':<10}" + ''.join(f"{stage:>14}" for stage in STAGES))
+    for mode, preload in (('lazy', False), ('preload', True)):
+        samples = [sample(preload) for _ in range(args.samples)]
+        medians = [statistics.median(s[stage] for s in samples) * 1000 for stage in STAGES]
+        print(f"  {mode:<10}" + ''.join(f"{value:>14.1f}" for value in medians))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare the directed TSP pipeline with the symmetric engine on random
+symmetric graphs: closure build time, peak memory and solve time.
+
+Usage (from the backend directory):
+    python -m benchmarks.symmetric_tsp_bench --nodes 50 100 200
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import networkx as nx
+
+import app.utils as utils
+from app.symmetric_tsp import SymmetricClosure
+
+
+def random_symmetric_graph(num_nodes, extra_edge_prob=0.1, seed=None):
+    """A connected random DiGraph where every edge has an equal-weight reverse edge."""
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    # a ring keeps the graph connected
+    for i in range(num_nodes):
+        j = (i + 1) % num_nodes
+        weight = rng.uniform(1, 10)
+        G.add_edge(i, j, weight=weight)
+        G.add_edge(j, i, weight=weight)
+    for i in range(num_nodes):
+        for j in range(i + 2, num_nodes):
+            if rng.random() < extra_edge_prob:
+                weight = rng.uniform(1, 10)
+                G.add_edge(i, j, weight=weight)
+                G.add_edge(j, i, weight=weight)
+    return G
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--methods', nargs='+', default=['greedy', 'simulated_annealing'])
+    args = parser.parse_args()
+
+    print(f"{'nodes':>6} {'stage':<28}{'directed s':>12}{'symmetric s':>13}{'directed MB':>13}{'symmetric MB':>14}")
+    for num_nodes in args.nodes:
+        G = random_symmetric_graph(num_nodes, seed=num_nodes)
+
+        _, directed_time, directed_mem = measure(lambda: utils.complete_graph(G))
+        _, symmetric_time, symmetric_mem = measure(lambda: SymmetricClosure(G))
+        print(f"{num_nodes:>6} {'closure':<28}{directed_time:>12.3f}{symmetric_time:>13.3f}"
+              f"{directed_mem:>13.2f}{symmetric_mem:>14.2f}")
+
+        for method in args.methods:
+            path, directed_time, directed_mem = measure(lambda: utils.traveling_salesman_path(G, method, symmetric=False))
+            directed_cost = utils.get_path_cost(G, path)
+            path, symmetric_time, symmetric_mem = measure(lambda: utils.traveling_salesman_path(G, method, symmetric=True))
+            symmetric_cost = utils.get_path_cost(G, path)
+            print(f"{num_nodes:>6} {method:<28}{directed_time:>12.3f}{symmetric_time:>13.3f}"
+                  f"{directed_mem:>13.2f}{symmetric_mem:>14.2f}"
+                  f"   cost {directed_cost:.2f} -> {symmetric_cost:.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Throughput benchmark for the TSP run write path under concurrent clients.
+
+Two scenarios, each with the write-behind buffer on and off:
+  distinct   every client solves its own graph, so every request stores a run
+  identical  all clients send the same solve at once, so in-flight requests
+             are coalesced into one computation and one stored run
+
+Requests go through the Flask test client from one thread per client,
+against a temporary SQLite file unless --database-url points at an empty
+database (see benchmarks.database).
+
+Usage (from the backend directory):
+    python -m benchmarks.tsp_write_bench --clients 8 --requests 25
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models import TSPRun
+from benchmarks.database import add_database_arguments, check_database
+
+
+def ring_graph(num_nodes):
+    edges = []
+    for i in range(num_nodes):
+        for j in ((i + 1) % num_nodes, (i + 2) % num_nodes):
+            edges.append({'from': i, 'to': j, 'weight': random.uniform(1, 10)})
+    return {'nodes': [{'label': i} for i in range(num_nodes)], 'edges': edges}
+
+
+def setup_app(database_url, write_behind):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'JWT_SECRET_KEY': 'write-benchmark-secret-key-0123456789',
+        'TSP_RUN_WRITE_BEHIND': write_behind,
+    })
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        commits = [0]
+
+        # count only commits of transactions that wrote, not read-only ones ended early
+        @event.listens_for(db.engine, 'after_cursor_execute')
+        def mark_write(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith('SELECT'):
+                conn.info['wrote'] = True
+
+        @event.listens_for(db.engine, 'commit')
+        def count_commit(conn):
+            if conn.info.pop('wrote', False):
+                commits[0] += 1
+
+        @event.listens_for(db.engine, 'rollback')
+        def clear_write(conn):
+            conn.info.pop('wrote', None)
+
+    client = app.test_client()
+    client.post('/api/register', json={'username': 'bench', 'password': 'bench'})
+    token = client.post('/api/login', json={'username': 'bench', 'password': 'bench'}).get_json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+    return app, headers, commits
+
+
+def run_clients(app, num_clients, target):
+    barrier = threading.Barrier(num_clients)
+    errors = []
+
+    def client_thread(index):
+        client = app.test_client()
+        barrier.wait()
+        try:
+            target(client, index)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=client_thread, args=(i,)) for i in range(num_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def distinct_scenario(database_url, write_behind, args):
+    app, headers, commits = setup_app(database_url, write_behind)
+    graph_ids = [
+        app.test_client().post('/api/graphs', json={'name': f'g{i}', 'data': ring_graph(args.nodes)},
+                               headers=headers).get_json()['graph_id']
+        for i in range(args.clients)
+    ]
+    commits[0] = 0
+
+    def target(client, index):
+        for _ in range(args.requests):
+            response = client.get(f'/api/graphs/{graph_ids[index]}/tsp?algo=greedy', headers=headers)
+            assert response.status_code == 200, response.get_json()
+
+    elapsed = run_clients(app, args.clients, target)
+    with app.app_context():
+        rows = TSPRun.query.count()
+    return args.clients * args.requests, elapsed, rows, commits[0]
+
+
+def identical_scenario(database_url, write_behind, args):
+    app, headers, commits = setup_app(database_url, write_behind)
+    graph_id = app.test_client().post('/api/graphs', json={'name': 'g', 'data': ring_graph(args.nodes)},
+                                      headers=headers).get_json()['graph_id']
+    commits[0] = 0
+
+    def target(client, index):
+        response = client.get(f'/api/graphs/{graph_id}/tsp?algo=simulated_annealing', headers=headers)
+        assert response.status_code == 200, response.get_json()
+
+    elapsed = run_clients(app, args.clients, target)
+    with app.app_context():
+        rows = TSPRun.query.count()
+    return args.clients, elapsed, rows, commits[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=25, help='requests per client in the distinct scenario')
+    parser.add_argument('--nodes', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    tmp_dir = None
+    database_url = args.database_url
+    if not database_url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        database_url = 'sqlite:///' + os.path.join(tmp_dir.name, 'write_bench.db')
+    # checked once up front: each scenario then drops only the tables the previous one created
+    check_database(database_url, args.drop_existing)
+
+    print(f"{args.clients} concurrent clients")
+    print(f"  {'scenario':<11}{'write-behind':<14}{'requests':>9}{'seconds':>9}{'req/s':>9}{'rows':>7}{'commits':>9}")
+    for name, scenario in (('distinct', distinct_scenario), ('identical', identical_scenario)):
+        for write_behind in (False, True):
+            requests, elapsed, rows, commits = scenario(database_url, write_behind, args)
+            print(f"  {name:<11}{'on' if write_behind else 'off':<14}{requests:>9}{elapsed:>9.2f}"
+                  f"{requests / elapsed:>9.1f}{rows:>7}{commits:>9}")
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url})
+    with app.app_context():
+        db.drop_all()
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,28 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL')  # Need to set up a postgres database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool tuning, see app.extensions.engine_options
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+    # Graphs with more edges than this get their summary computed in the background
+    GRAPH_SUMMARY_SYNC_MAX_EDGES = int(os.getenv('GRAPH_SUMMARY_SYNC_MAX_EDGES', 5000))
+
+    # Group-commit TSP run inserts on a background writer, see app.run_writer.
+    # With one thread per worker there is nothing to batch, so it defaults to on only for GUNICORN_THREADS > 1.
+    TSP_RUN_WRITE_BEHIND = os.getenv('TSP_RUN_WRITE_BEHIND', str(int(os.getenv('GUNICORN_THREADS', 1)) > 1)).lower() == 'true'
+    TSP_RUN_BATCH_SIZE = int(os.getenv('TSP_RUN_BATCH_SIZE', 50))
+    TSP_RUN_BATCH_DELAY = float(os.getenv('TSP_RUN_BATCH_DELAY', 0.005))  # Max seconds a run waits for a batch to fill
+    TSP_RUN_WRITE_TIMEOUT = float(os.getenv('TSP_RUN_WRITE_TIMEOUT', 10))  # Max seconds a request waits for its run to be stored
+    # Max seconds a request waits on an identical solve already in flight, on top of TSP_RUN_WRITE_TIMEOUT
+    TSP_SOLVE_WAIT_TIMEOUT = float(os.getenv('TSP_SOLVE_WAIT_TIMEOUT', 300))
+
+    # Import and exercise the TSP solvers in create_app instead of on the first request.
+    # gunicorn.conf.py turns this on so the work happens once in the pre-fork master.
+    PRELOAD_SOLVERS = os.getenv('PRELOAD_SOLVERS', 'false').lower() == 'true'
+
     # Put your own secret keys in a .flaskenv file
     SECRET_KEY = os.getenv('SECRET_KEY', 'secret_key')
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt_secret_key')
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings, used automatically when gunicorn is started from this directory:
+    gunicorn run:app
+
+The app is loaded once in the master (preload_app) with the TSP solvers
+warmed up, then workers are forked and share those pages copy-on-write.
+"""
+import gc
+import multiprocessing
+import os
+
+os.environ.setdefault('PRELOAD_SOLVERS', 'true')
+
+bind = os.getenv('GUNICORN_BIND', '127.0.0.1:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# more than one thread switches to the gthread worker and turns on the TSP run
+# writer (TSP_RUN_WRITE_BEHIND), which batches inserts from concurrent requests
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+preload_app = True
+
+
+def when_ready(server):
+    # Move everything allocated during preload out of the collector's view,
+    # so collections in the workers don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Each worker needs its own database connections, not the master's
+    from run import app
+    from app.extensions import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,29 @@
+import pytest
+
+from app import create_app
+from app.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'TESTING': True,
+        'JWT_SECRET_KEY': 'test-secret-key-0123456789abcdef',
+        'TSP_RUN_WRITE_BEHIND': False,
+    })
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(client):
+    client.post('/api/register', json={'username': 'tester', 'password': 'secret'})
+    token = client.post('/api/login', json={'username': 'tester', 'password': 'secret'}).get_json()['access_token']
+    return {'Authorization': f'Bearer {token}'}
@@ -0,0 +1,139 @@
+import os
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from app.extensions import db
+from app.models import TSPRun
+from app.run_writer import SingleFlight, TSPRunWriter, store_tsp_run
+
+
+def run_values(graph_id=1):
+    return dict(graph_id=graph_id, algorithm='greedy', path=[0, 1, 2, 0], cost=3.0, time_to_calculate=0.1)
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+    follower.start()
+    # give the follower time to join the leader's call
+    follower.join(0.2)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('done', False), ('done', True)]
+    # the key is released once the call finishes
+    assert flight.do('key', lambda: 'again') == ('again', False)
+
+
+def test_single_flight_propagates_exceptions():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 1) == (1, False)
+
+
+def test_writer_fails_only_the_bad_run(app):
+    # a full batch is written at once, so the bad row fails the group commit
+    writer = TSPRunWriter(app, max_batch=3, max_delay=5)
+    futures = [writer.submit(**run_values(graph_id)) for graph_id in (1, None, 1)]
+
+    good_ids = [futures[0].result(5), futures[2].result(5)]
+    with pytest.raises(RuntimeError):
+        futures[1].result(5)
+
+    with app.app_context():
+        assert sorted(run.id for run in TSPRun.query.all()) == sorted(good_ids)
+
+
+def test_store_tsp_run_times_out(app):
+    class StalledWriter:
+        pid = os.getpid()
+
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, **values):
+            self.futures.append(Future())
+            return self.futures[-1]
+
+    app.config.update(TSP_RUN_WRITE_BEHIND=True, TSP_RUN_WRITE_TIMEOUT=0.05)
+    writer = app.extensions['tsp_run_writer'] = StalledWriter()
+
+    with app.app_context():
+        with pytest.raises(RuntimeError, match="Timed out"):
+            store_tsp_run(**run_values())
+    # the writer will skip the abandoned run
+    assert writer.futures[0].cancelled()
+
+
+def test_store_tsp_run_through_writer(app):
+    app.config.update(TSP_RUN_WRITE_BEHIND=True)
+    with app.app_context():
+        run_id = store_tsp_run(**run_values())
+        assert db.session.get(TSPRun, run_id).cost == 3.0
+
+
+def test_single_flight_follower_times_out():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+    leader.start()
+    started.wait(5)
+
+    with pytest.raises(TimeoutError):
+        flight.do('key', slow, timeout=0.05)
+
+    release.set()
+    leader.join(5)
+    assert results == [('done', False)]
+
+
+def test_tsp_route_ends_transaction_before_joining_flight(client, auth_headers, monkeypatch):
+    import app.run_writer as run_writer
+
+    data = {'nodes': [], 'edges': [{'from': i, 'to': (i + 1) % 4, 'weight': 1} for i in range(4)]}
+    graph_id = client.post('/api/graphs', json={'name': 'g', 'data': data},
+                           headers=auth_headers).get_json()['graph_id']
+
+    in_transaction = []
+
+    class RecordingFlight(SingleFlight):
+        def do(self, key, fn, timeout=None):
+            in_transaction.append(db.session().in_transaction())
+            return super().do(key, fn, timeout)
+
+    monkeypatch.setattr(run_writer, 'tsp_solves', RecordingFlight())
+    response = client.get(f'/api/graphs/{graph_id}/tsp?algo=greedy', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert in_transaction == [False]
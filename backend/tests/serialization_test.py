@@ -0,0 +1,76 @@
+import json
+import math
+from datetime import datetime
+
+import pytest
+
+from app.serialization import COMPACT_MIMETYPE, compact_graph, orjson
+
+WIDE_INT = 123456789012345678901234567890
+
+
+def test_dumps_falls_back_for_wide_integers(app):
+    assert json.loads(app.json.dumps({'n': WIDE_INT})) == {'n': WIDE_INT}
+
+    response = app.json.response({'n': WIDE_INT})
+    assert json.loads(response.get_data()) == {'n': WIDE_INT}
+
+
+@pytest.mark.skipif(orjson is None, reason="orjson not installed")
+def test_response_uses_orjson(app):
+    response = app.json.response({'a': [1, 2], 'b': None})
+
+    assert response.get_data() == b'{"a":[1,2],"b":null}\n'
+    assert response.mimetype == 'application/json'
+
+
+def test_datetimes_keep_http_date_format(app):
+    when = datetime(2024, 1, 2, 3, 4, 5)
+
+    assert json.loads(app.json.dumps({'t': when})) == {'t': 'Tue, 02 Jan 2024 03:04:05 GMT'}
+    assert json.loads(app.json.response({'t': when}).get_data()) == {'t': 'Tue, 02 Jan 2024 03:04:05 GMT'}
+
+
+def test_loads_accepts_what_the_standard_library_accepts(app):
+    assert app.json.loads(str(WIDE_INT)) == WIDE_INT
+    assert math.isnan(app.json.loads('NaN'))
+    assert app.json.loads('[Infinity]') == [math.inf]
+
+
+def test_wide_integer_weights_round_trip(client, auth_headers):
+    data = {'nodes': [{'label': 0}, {'label': 1}], 'edges': [{'from': 0, 'to': 1, 'weight': WIDE_INT}]}
+    response = client.post('/api/graphs', data=json.dumps({'name': 'g', 'data': data}),
+                           content_type='application/json', headers=auth_headers)
+    graph_id = response.get_json()['graph_id']
+
+    body = json.loads(client.get(f'/api/graphs/{graph_id}', headers=auth_headers).get_data())
+    assert body['graph']['edges'][0]['weight'] == WIDE_INT
+
+
+def test_compact_format_is_negotiated(client, auth_headers):
+    data = {'nodes': [{'label': 0}, {'label': 1}],
+            'edges': [{'from': 0, 'to': 1, 'weight': 2}, {'from': 1, 'to': 0, 'weight': 3}]}
+    graph_id = client.post('/api/graphs', json={'name': 'g', 'data': data},
+                           headers=auth_headers).get_json()['graph_id']
+    url = f'/api/graphs/{graph_id}'
+
+    plain = client.get(url, headers=auth_headers)
+    assert plain.mimetype == 'application/json'
+    assert plain.get_json()['graph'] == data
+    assert 'Accept' in plain.vary
+
+    compact = client.get(url, headers={**auth_headers, 'Accept': COMPACT_MIMETYPE})
+    assert compact.mimetype == COMPACT_MIMETYPE
+    assert 'Accept' in compact.vary
+    assert json.loads(compact.get_data())['graph']['edges'] == {'from': [0, 1], 'to': [1, 0], 'weight': [2, 3]}
+
+    # plain JSON wins when the client rates it higher
+    preferred = client.get(url, headers={**auth_headers, 'Accept': f'application/json, {COMPACT_MIMETYPE};q=0.5'})
+    assert preferred.mimetype == 'application/json'
+
+
+def test_compact_graph_fills_missing_keys():
+    graph = compact_graph({'nodes': [{'label': 0}, {'label': 1, 'x': 5}], 'edges': []})
+
+    assert graph['nodes'] == {'label': [0, 1], 'x': [None, 5]}
+    assert graph['edges'] == {}
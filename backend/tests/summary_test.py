@@ -0,0 +1,122 @@
+import pytest
+
+import app.summary as summary
+import app.utils as utils
+from app.extensions import db
+from app.models import Graph
+
+
+def path_graph(weights, symmetric=False):
+    """A directed path 0 -> 1 -> ... with the given weights, plus the reverse edges if symmetric."""
+    edges = [{'from': i, 'to': i + 1, 'weight': w} for i, w in enumerate(weights)]
+    if symmetric:
+        edges += [{'from': e['to'], 'to': e['from'], 'weight': e['weight']} for e in edges]
+    return {'nodes': [{'label': i} for i in range(len(weights) + 1)], 'edges': edges}
+
+
+def wait_for_summaries():
+    # the single worker runs jobs in order, so this returns once earlier jobs are done
+    summary._get_executor().submit(lambda: None).result(10)
+
+
+def graph_summaries(client, auth_headers):
+    body = client.get('/api/graphs', headers=auth_headers).get_json()
+    return {graph['id']: graph['summary'] for graph in body['graphs']}
+
+
+def test_graph_summary_metrics():
+    data = path_graph([1, 3], symmetric=True)
+    data['nodes'].append({'label': 'isolated'})
+
+    assert utils.graph_summary(data) == {
+        'node_count': 4,
+        'edge_count': 4,
+        'density': pytest.approx(4 / 12),
+        'weight_min': 1,
+        'weight_max': 3,
+        'weight_mean': 2,
+        'scc_count': 2,
+        'is_symmetric': True,
+    }
+    assert utils.graph_summary(path_graph([1, 2]))['is_symmetric'] is False
+    assert utils.graph_summary({})['density'] == 0.0
+
+
+@pytest.mark.parametrize('data', [
+    [1, 2],
+    {'nodes': 'abc'},
+    {'nodes': [1]},
+    {'nodes': [{'label': [1]}]},
+    {'edges': [{'from': 0, 'to': 1}]},
+    {'edges': [{'from': [0], 'to': 1, 'weight': 1}]},
+    {'edges': [{'from': 0, 'to': 1, 'weight': '1'}]},
+    {'edges': [{'from': 0, 'to': 1, 'weight': True}]},
+])
+def test_invalid_graph_data_is_rejected(client, auth_headers, data):
+    assert summary.validate_graph_data(data) is not None
+    assert client.post('/api/graphs', json={'name': 'g', 'data': data}, headers=auth_headers).status_code == 400
+
+
+def test_small_graph_is_summarized_inline(client, auth_headers):
+    graph_id = client.post('/api/graphs', json={'name': 'g', 'data': path_graph([1, 2])},
+                           headers=auth_headers).get_json()['graph_id']
+
+    assert graph_summaries(client, auth_headers)[graph_id]['edge_count'] == 2
+
+
+def test_large_graph_is_summarized_in_background(app, client, auth_headers):
+    app.config['GRAPH_SUMMARY_SYNC_MAX_EDGES'] = 1
+    graph_id = client.post('/api/graphs', json={'name': 'g', 'data': path_graph([1, 2, 3])},
+                           headers=auth_headers).get_json()['graph_id']
+    wait_for_summaries()
+
+    assert graph_summaries(client, auth_headers)[graph_id]['edge_count'] == 3
+
+    # an update clears the stale summary until the new one is computed
+    with app.app_context():
+        graph = db.session.get(Graph, graph_id)
+        graph.data = path_graph([1, 2])
+        assert summary.update_graph_summary(graph) is False
+        assert graph.summary is None
+
+
+def test_stale_background_job_keeps_newer_summary(app, client, auth_headers, monkeypatch):
+    app.config['GRAPH_SUMMARY_SYNC_MAX_EDGES'] = 1
+    graph_id = client.post('/api/graphs', json={'name': 'g', 'data': path_graph([1, 2, 3])},
+                           headers=auth_headers).get_json()['graph_id']
+    wait_for_summaries()
+
+    original = utils.graph_summary
+
+    def summarize_then_update(data):
+        # a newer, inline-summarized update lands while the job is computing
+        monkeypatch.setattr(utils, 'graph_summary', original)
+        result = original(data)
+        app.config['GRAPH_SUMMARY_SYNC_MAX_EDGES'] = 5000
+        response = client.put(f'/api/graphs/{graph_id}', json={'data': path_graph([7])}, headers=auth_headers)
+        assert response.status_code == 200
+        return result
+
+    monkeypatch.setattr(utils, 'graph_summary', summarize_then_update)
+    with app.app_context():
+        summary.schedule_graph_summary(graph_id).result(10)
+
+    newer = graph_summaries(client, auth_headers)[graph_id]
+    assert (newer['edge_count'], newer['weight_max']) == (1, 7)
+
+
+def test_summarize_graphs_command_backfills(app):
+    with app.app_context():
+        db.session.add_all([
+            Graph(name='ok', user_id=1, data=path_graph([1, 2])),
+            Graph(name='bad', user_id=1, data={'nodes': [{'label': [1]}]}),
+        ])
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['summarize-graphs'])
+
+    assert "Skipping graph 2" in result.output
+    assert "Summarized 1 of 2 graphs." in result.output
+    with app.app_context():
+        assert db.session.get(Graph, 1).summary['edge_count'] == 2
+        assert db.session.get(Graph, 2).summary is None
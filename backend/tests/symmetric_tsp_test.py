@@ -0,0 +1,114 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import app.symmetric_tsp as symmetric_tsp
+import app.utils as utils
+from app.symmetric_tsp import SymmetricClosure, nearest_neighbor_tour, two_opt
+from benchmarks.symmetric_tsp_bench import random_symmetric_graph
+
+
+@pytest.mark.parametrize("num_nodes, chunk_size", [(2, 64), (7, 3), (30, 64), (30, 4)])
+def test_closure_matches_all_pairs_dijkstra(num_nodes, chunk_size):
+    G = random_symmetric_graph(num_nodes, 0.3, seed=num_nodes)
+    closure = SymmetricClosure(G, chunk_size=chunk_size)
+    expected = dict(nx.all_pairs_dijkstra_path_length(G, weight='weight'))
+    index = {node: i for i, node in enumerate(closure.nodes)}
+
+    assert len(closure.condensed) == num_nodes * (num_nodes - 1) // 2
+    for u in G:
+        row = closure.row(index[u])
+        for v in G:
+            assert row[index[v]] == pytest.approx(expected[u][v])
+
+    u, v = np.triu_indices(num_nodes, k=1)
+    for a, b in ((u, v), (v, u)):
+        pairs = closure.pair(a, b)
+        for i, j, dist in zip(a, b, pairs):
+            assert dist == pytest.approx(expected[closure.nodes[i]][closure.nodes[j]])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_two_opt_returns_permutation_no_worse(seed):
+    G = random_symmetric_graph(25, 0.3, seed=seed)
+    closure = SymmetricClosure(G)
+    start = list(range(closure.n))
+    random.Random(seed).shuffle(start)
+
+    improved = two_opt(closure, start)
+
+    assert sorted(improved) == list(range(closure.n))
+    assert closure.tour_cost(improved) <= closure.tour_cost(start) + 1e-9
+
+
+def test_two_opt_improves_nearest_neighbor_and_keeps_short_tours():
+    closure = SymmetricClosure(random_symmetric_graph(40, 0.3, seed=1))
+    tour = nearest_neighbor_tour(closure)
+    assert closure.tour_cost(two_opt(closure, tour)) <= closure.tour_cost(tour) + 1e-9
+
+    small = SymmetricClosure(random_symmetric_graph(3, 0.3, seed=2))
+    assert two_opt(small, [2, 0, 1]) == [2, 0, 1]
+
+
+@pytest.mark.parametrize("method", ['greedy', 'two_opt', 'christofides'])
+def test_symmetric_methods_visit_every_node(method):
+    G = random_symmetric_graph(12, 0.3, seed=3)
+    path = utils.traveling_salesman_path(G, method)
+
+    assert path[0] == path[-1]
+    assert set(path) == set(G.nodes)
+    utils.get_path_cost(G, path)
+
+
+def test_symmetric_only_methods_reject_directed_graphs():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from([(0, 1, 1), (1, 2, 1), (2, 0, 1)])
+    with pytest.raises(ValueError):
+        utils.traveling_salesman_path(G, 'two_opt')
+
+
+def test_compress_tour_keeps_first_visits():
+    assert utils.compress_tour([0, 1, 2, 1, 3, 0]) == [0, 1, 2, 3]
+    assert utils.compress_tour(['a', 'b', 'a']) == ['a', 'b']
+    assert utils.compress_tour([]) == []
+
+
+def test_warm_start_from_compressed_tour_visits_every_node():
+    G = random_symmetric_graph(15, 0.3, seed=4)
+    cold = utils.traveling_salesman_path(G, 'greedy')
+    init_order = utils.compress_tour(cold)
+
+    warm = utils.traveling_salesman_path(G, 'two_opt', init_order=init_order)
+
+    assert set(warm) == set(G.nodes)
+    assert utils.get_path_cost(G, warm) <= utils.get_path_cost(G, cold) + 1e-9
+    with pytest.raises(ValueError):
+        utils.traveling_salesman_path(G, 'two_opt', init_order=init_order[:-1])
+
+
+def test_swap_delta_matches_recomputed_cost():
+    closure = SymmetricClosure(random_symmetric_graph(9, 0.3, seed=5))
+    dist = closure.lookup()
+    tour = nearest_neighbor_tour(closure)
+    for a in range(1, closure.n):
+        for b in range(a + 1, closure.n):
+            swapped = list(tour)
+            swapped[a], swapped[b] = swapped[b], swapped[a]
+            delta = symmetric_tsp._swap_delta(dist, tour, a, b)
+            assert delta == pytest.approx(closure.tour_cost(swapped) - closure.tour_cost(tour))
+
+
+@pytest.mark.parametrize("search", [symmetric_tsp.simulated_annealing, symmetric_tsp.threshold_accepting])
+def test_annealing_returns_permutation_no_worse(search):
+    closure = SymmetricClosure(random_symmetric_graph(30, 0.3, seed=6))
+    start = list(range(closure.n))
+    random.Random(6).shuffle(start)
+
+    tour = search(closure, start, max_iterations=20, seed=1)
+
+    assert sorted(tour) == list(range(closure.n))
+    assert tour[0] == start[0]
+    assert closure.tour_cost(tour) <= closure.tour_cost(start) + 1e-9
+    assert search(closure, start, max_iterations=20, seed=1) == tour
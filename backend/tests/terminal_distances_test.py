@@ -0,0 +1,58 @@
+import random
+
+import networkx as nx
+import pytest
+
+import app.utils as utils
+
+
+def random_digraph(num_nodes, seed, edge_prob=0.15):
+    rng = random.Random(seed)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(num_nodes))
+    for u in range(num_nodes):
+        for v in range(num_nodes):
+            if u != v and rng.random() < edge_prob:
+                G.add_edge(u, v, weight=rng.uniform(1, 10))
+    return G
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_distance_matrix_matches_networkx(seed):
+    G = random_digraph(40, seed)
+    terminals = random.Random(seed).sample(list(G.nodes), 6)
+    expected = dict(nx.all_pairs_dijkstra_path_length(G, weight='weight'))
+
+    distances, paths = utils.terminal_distance_matrix(G, terminals, with_paths=True)
+
+    for i, u in enumerate(terminals):
+        for j, v in enumerate(terminals):
+            if v in expected[u]:
+                assert distances[i][j] == pytest.approx(expected[u][v])
+                assert paths[i][j][0] == u and paths[i][j][-1] == v
+                assert utils.get_path_cost(G, paths[i][j]) == pytest.approx(expected[u][v])
+            else:
+                assert distances[i][j] is None
+                assert paths[i][j] is None
+
+
+def test_unreachable_terminals_are_none():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from([('a', 'b', 1), ('b', 'c', 2)])
+
+    assert utils.terminal_distance_matrix(G, ['a', 'c']) == [[0.0, 3], [None, 0.0]]
+    with pytest.raises(ValueError):
+        utils.terminal_tsp_path(G, ['a', 'b', 'c'])
+
+
+def test_terminal_tsp_path_visits_every_terminal():
+    G = nx.DiGraph()
+    # a directed ring with one long shortcut; terminals skip node 2
+    G.add_weighted_edges_from([(i, (i + 1) % 6, 1) for i in range(6)] + [(0, 3, 10)])
+    terminals = [0, 3, 5]
+
+    path = utils.terminal_tsp_path(G, terminals, 'greedy')
+
+    assert path[0] == path[-1]
+    assert set(terminals) <= set(path)
+    assert utils.get_path_cost(G, path) == pytest.approx(6)
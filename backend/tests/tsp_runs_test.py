@@ -0,0 +1,76 @@
+import pytest
+
+from app.extensions import db
+from app.models import Graph, TSPRun, User
+
+
+def add_runs(app, runs):
+    """Insert runs as (algorithm, cost, time_to_calculate) for a new graph and return its id."""
+    with app.app_context():
+        user = User.query.first()
+        graph = Graph(name='g', user_id=user.id, data={'nodes': [], 'edges': []})
+        db.session.add(graph)
+        db.session.flush()
+        db.session.add_all(
+            TSPRun(graph_id=graph.id, algorithm=algorithm, path=[0, 1, 0], cost=cost, time_to_calculate=seconds)
+            for algorithm, cost, seconds in runs
+        )
+        db.session.commit()
+        return graph.id
+
+
+def test_stats_median_averages_middle_values(app, auth_headers):
+    graph_id = add_runs(app, [('greedy', cost, cost / 10) for cost in (10, 1, 4, 2, 5, 3)]
+                        + [('asadpour', cost, 1.0) for cost in (7, 3, 5)])
+
+    with app.app_context():
+        stats = TSPRun.stats_by_algorithm(graph_id, (50, 90))
+
+    greedy = stats['greedy']
+    assert greedy['runs'] == 6
+    assert greedy['cost']['median'] == pytest.approx(3.5)
+    # nearest rank: the lower middle value
+    assert greedy['cost']['p50'] == 3
+    assert greedy['cost']['p90'] == 10
+    assert greedy['cost']['min'] == 1 and greedy['cost']['max'] == 10
+    assert greedy['cost']['mean'] == pytest.approx(25 / 6)
+    assert greedy['time_to_calculate']['median'] == pytest.approx(0.35)
+
+    assert stats['asadpour']['cost']['median'] == pytest.approx(5)
+    assert stats['asadpour']['cost']['p50'] == 5
+
+
+def test_stats_route(client, app, auth_headers):
+    graph_id = add_runs(app, [('greedy', 2.0, 0.1), ('greedy', 4.0, 0.3)])
+
+    response = client.get(f'/api/graphs/{graph_id}/tsp/runs/stats?percentiles=50', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.get_json()['algorithms']['greedy']['cost'] == {
+        'min': 2.0, 'max': 4.0, 'mean': 3.0, 'median': 3.0, 'p50': 2.0
+    }
+    assert client.get(f'/api/graphs/{graph_id}/tsp/runs/stats?percentiles=x', headers=auth_headers).status_code == 400
+    assert client.get(f'/api/graphs/{graph_id}/tsp/runs/stats?percentiles=0', headers=auth_headers).status_code == 400
+
+
+def test_runs_pagination(client, app, auth_headers):
+    graph_id = add_runs(app, [('greedy', float(cost), 0.1) for cost in range(5)])
+    url = f'/api/graphs/{graph_id}/tsp/runs'
+
+    body = client.get(f'{url}?page=2&per_page=2', headers=auth_headers).get_json()
+    assert (body['page'], body['per_page'], body['total'], body['pages']) == (2, 2, 5, 3)
+    assert [run['cost'] for run in body['runs']] == [2.0, 3.0]
+    assert 'path' in body['runs'][0]
+
+    runs = client.get(f'{url}?include_path=false', headers=auth_headers).get_json()
+    assert len(runs) == 5
+    assert all('path' not in run for run in runs)
+
+
+@pytest.mark.parametrize('query', ['page=abc', 'page=1&per_page=abc', 'page=0', 'page=1&per_page=500'])
+def test_runs_pagination_rejects_bad_parameters(client, app, auth_headers, query):
+    graph_id = add_runs(app, [('greedy', 1.0, 0.1)])
+
+    response = client.get(f'/api/graphs/{graph_id}/tsp/runs?{query}', headers=auth_headers)
+
+    assert response.status_code == 400